@@ -3,34 +3,50 @@ AWS Assistant Agent.
 Main agent module that orchestrates AWS operations with AI assistance.
 """
 
-from typing import List, Dict
-from langchain.chat_models import init_chat_model
-from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
 
 from config_manager import config
 from logger import logger
 
-# Import tools based on configuration
-from tools.aws.s3 import (
-    list_s3_buckets,
-    list_public_s3_buckets,
-    inspect_s3_bucket,
-    get_s3_bucket_info,
+try:
+    import orjson
+except ImportError:  # Optional; falls back to the stdlib encoder
+    orjson = None
+
+
+def _dumps_sorted(payload: Any) -> bytes:
+    """Serialize a payload to JSON bytes with sorted keys."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True).encode()
+
+
+# Missing space after a period, before a capital letter or a digit
+_RE_PERIOD_SPACING = re.compile(r"\.([A-Z\d])")
+
+# Static prefix of every request; keeping it first and unchanged lets the
+# provider's prompt cache reuse it across calls
+SYSTEM_PROMPT = (
+    "You are AWS Assistant, an AI-powered tool created by Brock Shelton to help users interact with AWS services in a read-only capacity. "
+    "Your capabilities include providing detailed information about AWS resources, such as S3 buckets, IAM users, groups, policies, roles, and EC2 instances. "
+    "You have strictly read-only access; you cannot create, modify, or delete any resources. "
+    "Always respond clearly and helpfully, explaining each action or command you describe. "
+    "For every tool output or information provided, include concise commentary and use clear formatting for readability, such as line breaks or bullet points. "
+    "If you encounter errors or limitations, explain them in friendly, non-technical language. "
+    "If a request is outside your read-only scope or unclear, politely inform the user and suggest what information you can provide. "
+    "You were created by Brock Shelton. "
 )
-from tools.aws.iam import (
-    list_iam_users,
-    list_iam_groups,
-    list_iam_policies,
-    list_iam_roles,
-    get_iam_user_details,
-    search_iam_users,
-)
-from tools.aws.ec2 import (
-    list_ec2_instances,
-    get_ec2_instance_details,
-    list_running_ec2_instances,
-    search_ec2_instances,
+
+HISTORY_SUMMARY_PROMPT = (
+    "Summarize the following conversation between a user and AWS Assistant. "
+    "Keep the AWS resource names, identifiers and findings that later questions "
+    "may refer to, and omit pleasantries. Reply with the summary only."
 )
 
 
@@ -44,6 +60,9 @@ class AWSAssistantAgent:
         self._setup_model()
         self._setup_tools()
         self._setup_agent()
+        self._setup_embeddings()
+        self._setup_cache()
+        self._setup_tool_selection()
         self.chat_history = []
         self.logger.info("AWS Assistant agent initialized successfully")
 
@@ -58,11 +77,19 @@ class AWSAssistantAgent:
 
     def _setup_model(self) -> None:
         """Set up the OpenAI model with configuration."""
+        # Heavy dependencies are imported on first use to keep cold start fast
+        from langchain.chat_models import init_chat_model
+
+        from callbacks import PromptCacheUsageHandler
+
         try:
             openai_config = config.get_openai_config()
+            self.prompt_cache_usage = PromptCacheUsageHandler()
             self.model = init_chat_model(
                 openai_config.get("model", "gpt-4o-mini"),
                 model_provider=openai_config.get("provider", "openai"),
+                temperature=openai_config.get("temperature", 0),
+                callbacks=[self.prompt_cache_usage],
             )
             self.logger.info(
                 f"OpenAI model initialized: {openai_config.get('model', 'gpt-4o-mini')}"
@@ -76,17 +103,35 @@ class AWSAssistantAgent:
         self.tools = []
 
         if config.is_service_enabled("s3"):
+            from tools.aws.s3 import (
+                list_s3_buckets,
+                list_public_s3_buckets,
+                inspect_s3_bucket,
+                get_s3_bucket_info,
+                audit_s3_public_buckets_with_info,
+            )
+
             self.tools.extend(
                 [
                     list_s3_buckets,
                     list_public_s3_buckets,
                     inspect_s3_bucket,
                     get_s3_bucket_info,
+                    audit_s3_public_buckets_with_info,
                 ]
             )
             self.logger.info("S3 tools enabled")
 
         if config.is_service_enabled("iam"):
+            from tools.aws.iam import (
+                list_iam_users,
+                list_iam_groups,
+                list_iam_policies,
+                list_iam_roles,
+                get_iam_user_details,
+                search_iam_users,
+            )
+
             self.tools.extend(
                 [
                     list_iam_users,
@@ -100,6 +145,13 @@ class AWSAssistantAgent:
             self.logger.info("IAM tools enabled")
 
         if config.is_service_enabled("ec2"):
+            from tools.aws.ec2 import (
+                list_ec2_instances,
+                get_ec2_instance_details,
+                list_running_ec2_instances,
+                search_ec2_instances,
+            )
+
             self.tools.extend(
                 [
                     list_ec2_instances,
@@ -115,42 +167,44 @@ class AWSAssistantAgent:
         else:
             self.logger.info(f"Loaded {len(self.tools)} tools")
 
+        # Tools are fixed after init, so the command list is built once
+        self._commands_cache = self._build_command_list()
+
+    def _system_message(self):
+        """Build the system message, marking it cacheable where required."""
+        if config.get("openai.provider", "openai") == "anthropic":
+            from langchain_core.messages import SystemMessage
+
+            # Anthropic only caches prefixes explicitly marked with cache_control
+            return SystemMessage(
+                content=[
+                    {
+                        "type": "text",
+                        "text": SYSTEM_PROMPT,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
+            )
+
+        # OpenAI caches long static prefixes automatically
+        return ("system", SYSTEM_PROMPT)
+
     def _setup_agent(self) -> None:
         """Set up the LangChain agent with tools and prompt."""
-        try:
-            agent_config = config.get_agent_config()
+        from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 
-            prompt = ChatPromptTemplate.from_messages(
+        try:
+            self.prompt = ChatPromptTemplate.from_messages(
                 [
-                    (
-                        "system",
-                        "You are AWS Assistant, an AI-powered tool created by Brock Shelton to help users interact with AWS services in a read-only capacity. "
-                        "Your capabilities include providing detailed information about AWS resources, such as S3 buckets, IAM users, groups, policies, roles, and EC2 instances. "
-                        "You have strictly read-only access; you cannot create, modify, or delete any resources. "
-                        "Always respond clearly and helpfully, explaining each action or command you describe. "
-                        "For every tool output or information provided, include concise commentary and use clear formatting for readability, such as line breaks or bullet points. "
-                        "If you encounter errors or limitations, explain them in friendly, non-technical language. "
-                        "If a request is outside your read-only scope or unclear, politely inform the user and suggest what information you can provide. "
-                        "You were created by Brock Shelton. ",
-                    ),
+                    self._system_message(),
                     MessagesPlaceholder(variable_name="chat_history"),
                     ("human", "{input}"),
                     MessagesPlaceholder(variable_name="agent_scratchpad"),
                 ]
             )
 
-            self.agent = create_openai_functions_agent(self.model, self.tools, prompt)
-
-            self.executor = AgentExecutor(
-                agent=self.agent,
-                tools=self.tools,
-                verbose=agent_config.get("verbose", True),
-                max_iterations=agent_config.get("max_iterations", 10),
-                return_intermediate_steps=agent_config.get(
-                    "return_intermediate_steps", False
-                ),
-                handle_parsing_errors=True,
-            )
+            self.agent, self.executor = self._build_executor(self.tools)
+            self._executors = {}
 
             self.logger.info("Agent executor created successfully")
 
@@ -158,6 +212,245 @@ class AWSAssistantAgent:
             self.logger.critical(f"Failed to set up agent: {e}", exc_info=e)
             raise
 
+    def _build_executor(self, tools: List[Any]) -> Tuple[Any, Any]:
+        """Build an agent and executor bound to the given tools."""
+        from langchain.agents import AgentExecutor, create_openai_tools_agent
+
+        agent_config = config.get_agent_config()
+
+        # The tools agent lets the model request several tool calls in one
+        # turn, which the executor runs concurrently on the async path
+        agent = create_openai_tools_agent(self.model, tools, self.prompt)
+
+        executor = AgentExecutor(
+            agent=agent,
+            tools=tools,
+            verbose=agent_config.get("verbose", True),
+            max_iterations=agent_config.get("max_iterations", 10),
+            return_intermediate_steps=agent_config.get(
+                "return_intermediate_steps", False
+            ),
+            handle_parsing_errors=True,
+        )
+        return agent, executor
+
+    def _setup_embeddings(self) -> None:
+        """Set up the embedding model used by the semantic cache and tool selection."""
+        self.embeddings = None
+
+        if not (
+            config.get("cache.semantic.enabled", False)
+            or config.get("agent.tool_selection.enabled", False)
+        ):
+            return
+
+        from langchain_openai import OpenAIEmbeddings
+
+        try:
+            self.embeddings = OpenAIEmbeddings(
+                model=config.get("openai.embedding_model", "text-embedding-3-small")
+            )
+        except Exception as e:
+            self.logger.warning(f"Embeddings unavailable: {e}")
+
+    def _setup_tool_selection(self) -> None:
+        """Embed tool descriptions for per-query tool selection if enabled."""
+        self.tool_selector = None
+
+        if self.embeddings is None or not config.get(
+            "agent.tool_selection.enabled", False
+        ):
+            return
+
+        from tool_selection import ToolSelector
+
+        try:
+            tool_embeddings = self.embeddings.embed_documents(
+                [f"{tool.name}: {tool.description}" for tool in self.tools]
+            )
+            self.tool_selector = ToolSelector(
+                self.tools,
+                tool_embeddings,
+                top_k=config.get("agent.tool_selection.top_k", 6),
+                min_similarity=config.get("agent.tool_selection.min_similarity", 0.2),
+            )
+            self.logger.info("Embedding-based tool selection enabled")
+        except Exception as e:
+            self.logger.warning(f"Tool selection disabled: {e}")
+
+    def _executor_for(self, query_embedding: Any) -> Any:
+        """Get an executor limited to the tools relevant to a query."""
+        if self.tool_selector is None or query_embedding is None:
+            return self.executor
+
+        tools = self.tool_selector.select(query_embedding)
+        if tools is None:
+            return self.executor
+
+        key = frozenset(tool.name for tool in tools)
+        if key not in self._executors:
+            self._executors[key] = self._build_executor(tools)[1]
+        self.logger.debug(f"Selected tools: {', '.join(sorted(key))}")
+        return self._executors[key]
+
+    def _setup_cache(self) -> None:
+        """Set up the exact-match and semantic response caches if enabled."""
+        # Entries map a key to (expiry time, response)
+        self._exact_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._exact_cache_size = config.get("cache.exact.max_entries", 256)
+        # Answers are built from AWS data, so they expire like cached AWS responses
+        self._exact_cache_ttl = config.get("cache.exact.ttl", 60)
+        # Responses are only reproducible when sampling is deterministic
+        self._exact_cache_enabled = (
+            config.get("cache.exact.enabled", True)
+            and config.get("openai.temperature", 0) <= 0
+        )
+
+        self.semantic_cache = None
+
+        if self.embeddings is None or not config.get("cache.semantic.enabled", False):
+            return
+
+        from response_cache import SemanticCache
+
+        self.semantic_cache = SemanticCache(
+            threshold=config.get("cache.semantic.threshold", 0.92),
+            max_entries=config.get("cache.semantic.max_entries", 512),
+            ttl=config.get("cache.semantic.ttl", 60),
+        )
+        self.logger.info("Semantic response cache enabled")
+
+    def _embed_query(self, query: str):
+        """Embed a query once for the semantic cache and tool selection."""
+        if self.embeddings is None:
+            return None
+
+        try:
+            return self.embeddings.embed_query(query)
+        except Exception as e:
+            self.logger.warning(f"Failed to embed query: {e}")
+            return None
+
+    def _exact_cache_key(self, query: str) -> Optional[str]:
+        """Build the exact-match cache key for a query, or None if disabled."""
+        if not self._exact_cache_enabled:
+            return None
+
+        payload = {
+            "q": query,
+            "tools": sorted(tool.name for tool in self.tools),
+            "hist": self.chat_history[-4:],
+        }
+        return hashlib.sha256(_dumps_sorted(payload)).hexdigest()
+
+    def _exact_cache_get(self, key: str) -> Optional[str]:
+        """Get an unexpired response from the exact-match cache, or None."""
+        entry = self._exact_cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._exact_cache[key]
+            return None
+
+        self._exact_cache.move_to_end(key)
+        return response
+
+    def _exact_cache_put(self, key: str, response: str) -> None:
+        """Store a response in the exact-match cache, evicting the oldest entry."""
+        self._exact_cache[key] = (time.monotonic() + self._exact_cache_ttl, response)
+        self._exact_cache.move_to_end(key)
+        while len(self._exact_cache) > self._exact_cache_size:
+            self._exact_cache.popitem(last=False)
+
+    def _semantic_cache_usable(self) -> bool:
+        """Check whether the semantic cache applies to the next query."""
+        # Entries are keyed on the query alone, so follow-ups such as "show the
+        # second one" would match answers from other conversations
+        return self.semantic_cache is not None and not self.chat_history
+
+    def _lookup_cache(self, query: str) -> Tuple[Optional[str], Optional[str], Any]:
+        """
+        Look up a query in the response caches.
+
+        Returns:
+            A tuple of (cached response or None, exact cache key, query embedding)
+        """
+        cache_key = self._exact_cache_key(query)
+        cached = self._exact_cache_get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            self.logger.debug("Exact cache hit")
+            return cached, cache_key, None
+
+        query_embedding = self._embed_query(query)
+        if query_embedding is not None and self._semantic_cache_usable():
+            cached = self.semantic_cache.get(query_embedding)
+            if cached is not None:
+                self.logger.debug("Semantic cache hit")
+                return cached, cache_key, query_embedding
+
+        return None, cache_key, query_embedding
+
+    def _record_exchange(
+        self,
+        query: str,
+        response: str,
+        cache_key: Optional[str] = None,
+        query_embedding: Any = None,
+    ) -> None:
+        """Store a fresh response in the caches and update chat history."""
+        if cache_key is not None:
+            self._exact_cache_put(cache_key, response)
+        if query_embedding is not None and self._semantic_cache_usable():
+            self.semantic_cache.put(query_embedding, query, response)
+
+        # Update chat history with this exchange
+        self.chat_history.extend([("human", query), ("ai", response)])
+
+    def _trim_history(self) -> None:
+        """
+        Keep the chat history within the configured window.
+
+        Once the history exceeds agent.history_window exchanges, everything but
+        the most recent half window is condensed into a single summary
+        message, so the summarisation call is paid every few turns rather
+        than on every turn.
+        """
+        window = config.get("agent.history_window", 8)
+        summary = None
+        turns = self.chat_history
+        if turns and turns[0][0] == "system":
+            summary, turns = turns[0][1], turns[1:]
+
+        if len(turns) <= 2 * window:
+            return
+
+        keep = 2 * max(window // 2, 1)
+        older, recent = turns[:-keep], turns[-keep:]
+        transcript = "\n".join(f"{role}: {content}" for role, content in older)
+        if summary:
+            transcript = f"Earlier summary: {summary}\n{transcript}"
+
+        try:
+            result = self.model.invoke(
+                [
+                    ("system", HISTORY_SUMMARY_PROMPT),
+                    ("human", transcript),
+                ]
+            )
+            summary = result.content
+        except Exception as e:
+            # Dropping the older turns still keeps the prompt bounded
+            self.logger.warning(f"Failed to summarize chat history: {e}")
+
+        self.chat_history = (
+            [("system", f"Summary of the earlier conversation: {summary}")]
+            if summary
+            else []
+        ) + recent
+        self.logger.debug(f"Condensed {len(older)} history messages into a summary")
+
     def run(self, query: str) -> str:
         """
         Run the agent with a user query.
@@ -174,16 +467,22 @@ class AWSAssistantAgent:
         query = query.strip()
         self.logger.debug(f"Processing query: {query}")
 
+        cached, cache_key, query_embedding = self._lookup_cache(query)
+        if cached is not None:
+            self.chat_history.extend([("human", query), ("ai", cached)])
+            return cached
+
         try:
-            result = self.executor.invoke(
+            self._trim_history()
+            executor = self._executor_for(query_embedding)
+            result = executor.invoke(
                 {"input": query, "chat_history": self.chat_history}
             )
             response = result.get("output", "No response generated.")
             response = self._fix_response_spacing(response)
             self.logger.debug("Query processed successfully")
 
-            # Update chat history with this exchange
-            self.chat_history.extend([("human", query), ("ai", response)])
+            self._record_exchange(query, response, cache_key, query_embedding)
 
             return response
 
@@ -192,18 +491,172 @@ class AWSAssistantAgent:
             self.logger.error(error_msg, exc_info=e)
             return f"I encountered an error while processing your request: {str(e)}"
 
+    async def arun(self, query: str) -> str:
+        """
+        Run the agent asynchronously with a user query.
+
+        Tool calls requested together in one turn are executed concurrently,
+        so a turn costs roughly the slowest tool rather than the sum of all.
+
+        Args:
+            query: The user's query or command
+
+        Returns:
+            The agent's response
+        """
+        if not query or not query.strip():
+            return "Please provide a valid query."
+
+        query = query.strip()
+        self.logger.debug(f"Processing query asynchronously: {query}")
+
+        cached, cache_key, query_embedding = await asyncio.to_thread(
+            self._lookup_cache, query
+        )
+        if cached is not None:
+            self.chat_history.extend([("human", query), ("ai", cached)])
+            return cached
+
+        try:
+            await asyncio.to_thread(self._trim_history)
+            executor = self._executor_for(query_embedding)
+            result = await executor.ainvoke(
+                {"input": query, "chat_history": self.chat_history}
+            )
+            response = result.get("output", "No response generated.")
+            response = self._fix_response_spacing(response)
+            self.logger.debug("Query processed successfully")
+
+            self._record_exchange(query, response, cache_key, query_embedding)
+
+            return response
+
+        except Exception as e:
+            error_msg = f"Failed to process query: {str(e)}"
+            self.logger.error(error_msg, exc_info=e)
+            return f"I encountered an error while processing your request: {str(e)}"
+
+    async def arun_stream(self, query: str) -> AsyncIterator[str]:
+        """
+        Run the agent with a user query, yielding response text as it is generated.
+
+        Args:
+            query: The user's query or command
+
+        Yields:
+            Chunks of the agent's response
+        """
+        if not query or not query.strip():
+            yield "Please provide a valid query."
+            return
+
+        query = query.strip()
+        self.logger.debug(f"Streaming query: {query}")
+
+        cached, cache_key, query_embedding = await asyncio.to_thread(
+            self._lookup_cache, query
+        )
+        if cached is not None:
+            self.chat_history.extend([("human", query), ("ai", cached)])
+            yield cached
+            return
+
+        chunks = []
+        output = None
+        # A trailing "." is held back until the next chunk arrives, so spacing
+        # fixes that span two chunks match the text stored in history and caches
+        held = ""
+        try:
+            await asyncio.to_thread(self._trim_history)
+            executor = self._executor_for(query_embedding)
+            async for event in executor.astream_events(
+                {"input": query, "chat_history": self.chat_history}, version="v2"
+            ):
+                if event["event"] == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    if content and isinstance(content, str):
+                        chunks.append(content)
+                        text = held + content
+                        held = "." if text.endswith(".") else ""
+                        text = self._fix_response_spacing(text[: len(text) - len(held)])
+                        if text:
+                            yield text
+                elif event["event"] == "on_chain_end" and not event["parent_ids"]:
+                    output = event["data"].get("output", {}).get("output")
+
+        except Exception as e:
+            error_msg = f"Failed to process query: {str(e)}"
+            self.logger.error(error_msg, exc_info=e)
+            yield f"I encountered an error while processing your request: {str(e)}"
+            return
+
+        if held:
+            yield held
+
+        response = output or "".join(chunks) or "No response generated."
+        response = self._fix_response_spacing(response)
+        self.logger.debug("Query processed successfully")
+
+        self._record_exchange(query, response, cache_key, query_embedding)
+
+    def run_batch(self, queries: List[str]) -> List[str]:
+        """
+        Run several independent queries through the agent in one batch.
+
+        Each query runs with an empty chat history so answers cannot leak
+        into one another, and the session history is left untouched.
+
+        Args:
+            queries: The user queries to process
+
+        Returns:
+            The agent's responses, in the same order as the queries
+        """
+        responses: List[Optional[str]] = [None] * len(queries)
+        inputs = []
+        positions = []
+
+        for i, query in enumerate(queries):
+            if not query or not query.strip():
+                responses[i] = "Please provide a valid query."
+            else:
+                inputs.append({"input": query.strip(), "chat_history": []})
+                positions.append(i)
+
+        if not inputs:
+            return responses
+
+        self.logger.debug(f"Processing batch of {len(inputs)} queries")
+        results = self.executor.batch(
+            inputs,
+            config={"max_concurrency": config.get("agent.batch_concurrency", 4)},
+            return_exceptions=True,
+        )
+
+        for i, result in zip(positions, results):
+            if isinstance(result, Exception):
+                self.logger.error("Failed to process batched query", exc_info=result)
+                responses[i] = (
+                    f"I encountered an error while processing your request: {result}"
+                )
+            else:
+                responses[i] = self._fix_response_spacing(
+                    result.get("output", "No response generated.")
+                )
+
+        return responses
+
     def _fix_response_spacing(self, response: str) -> str:
         """Fix spacing issues in the response."""
-        import re
-
-        # Add space after periods followed by capital letters
-        response = re.sub(r"\.([A-Z])", r". \1", response)
-        # Add space after periods followed by numbers
-        response = re.sub(r"\.(\d)", r". \1", response)
-        return response
+        # Add space after periods followed by capital letters or numbers
+        return _RE_PERIOD_SPACING.sub(r". \1", response)
 
     def get_available_commands(self) -> List[str]:
         """Get a list of available commands and their descriptions."""
+        return self._commands_cache
+
+    def _build_command_list(self) -> List[str]:
+        """Build the command descriptions for the loaded tools."""
         commands = []
 
         for tool in self.tools:
@@ -228,33 +681,36 @@ class AWSAssistantAgent:
 
     def test_aws_connection(self) -> Dict[str, bool]:
         """Test connections to AWS services."""
-        results = {}
+        from aws_client import AWSClient
+        from tools.aws import AWS_POOL
 
-        if config.is_service_enabled("s3"):
-            try:
-                from aws_client import AWSClient
-
-                s3_client = AWSClient("s3")
-                results["s3"] = s3_client.test_connection()
-            except Exception as e:
-                self.logger.error("S3 connection test failed", exc_info=e)
-                results["s3"] = False
+        services = [s for s in ("s3", "iam", "ec2") if config.is_service_enabled(s)]
+        if not services:
+            return {}
 
-        if config.is_service_enabled("iam"):
+        def test_service(service: str) -> bool:
             try:
-                from aws_client import AWSClient
-
-                iam_client = AWSClient("iam")
-                results["iam"] = iam_client.test_connection()
+                return AWSClient(service).test_connection()
             except Exception as e:
-                self.logger.error("IAM connection test failed", exc_info=e)
-                results["iam"] = False
+                self.logger.error(
+                    f"{service.upper()} connection test failed", exc_info=e
+                )
+                return False
 
-        return results
+        # Each test is a network round trip, so run them side by side
+        return dict(zip(services, AWS_POOL.map(test_service, services)))
 
     def clear_context(self):
-        """Clear the conversation history."""
+        """Clear the conversation history, cached answers and AWS responses."""
+        from aws_client import clear_response_cache
+        from tools.aws._cache import clear as clear_tool_cache
+
         self.chat_history = []
+        self._exact_cache.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
+        clear_tool_cache()
+        clear_response_cache()
 
     def get_context_summary(self):
         """Get a summary of the current conversation context."""
@@ -275,7 +731,12 @@ def get_agent():
 
 class LazyAgent:
     def __getattr__(self, name):
-        return getattr(get_agent(), name)
+        attr = getattr(get_agent(), name)
+        # Bound methods never change, so later lookups can skip __getattr__.
+        # Data attributes such as chat_history are rebound and must re-resolve.
+        if callable(attr):
+            object.__setattr__(self, name, attr)
+        return attr
 
 
 agent = LazyAgent()
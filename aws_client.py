@@ -3,9 +3,13 @@ Base AWS client with error handling and retry logic.
 Provides a robust foundation for AWS service interactions.
 """
 
-import boto3
+import hashlib
+import os
+import pickle
+import threading
 import time
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 from botocore.exceptions import (
     ClientError,
     NoCredentialsError,
@@ -14,37 +18,199 @@ from botocore.exceptions import (
     ConnectTimeoutError,
     ReadTimeoutError,
 )
-from botocore.config import Config
 from config_manager import config
 from logger import logger
 
 
+_AWS_ERRORS = (
+    ClientError,
+    EndpointConnectionError,
+    ConnectTimeoutError,
+    ReadTimeoutError,
+)
+
+# Error responses caused by the request rather than a fault, which are logged
+# without a traceback
+_EXPECTED_ERROR_CODES = frozenset(
+    {
+        "AccessDenied",
+        "NoSuchBucket",
+        "NoSuchEntity",
+        "ValidationError",
+        "InvalidInstanceID.NotFound",
+        "InvalidInstanceID.Malformed",
+        # HEAD requests have no error body, so only the status code is reported
+        "403",
+        "404",
+    }
+)
+
+
 class AWSClientError(Exception):
     """Custom exception for AWS client errors."""
 
     pass
 
 
+class AWSToolError(AWSClientError):
+    """An AWS operation failed; the message is suitable for showing to the user."""
+
+    def __init__(self, message: str, code: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+
+
+# Shared across all AWSClient instances; building a session or client loads
+# credentials and service models, which is too slow to repeat per instance
+_session = None
+_client_cache: Dict[Tuple, Any] = {}
+_client_lock = threading.Lock()
+
+
+def _get_session() -> Any:
+    """Get or create the shared boto3 session."""
+    global _session
+    if _session is None:
+        import boto3
+
+        _session = boto3.Session()
+    return _session
+
+
+@lru_cache(maxsize=None)
+def _client_config(
+    max_retries: int,
+    connect_timeout: float,
+    read_timeout: float,
+    max_pool_connections: int,
+    tcp_keepalive: bool,
+) -> Any:
+    """Get the botocore client configuration for the given settings."""
+    from botocore.config import Config
+
+    return Config(
+        # Adaptive mode adds client-side rate limiting on top of retries
+        retries=dict(max_attempts=max_retries, mode="adaptive"),
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        # The default pool of 10 sockets would serialise concurrent tool calls
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=tcp_keepalive,
+    )
+
+
+# Disk-backed cache of read-only AWS responses, shared across sessions
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def _get_response_cache() -> Any:
+    """Get or open the disk cache for AWS responses, or None if disabled."""
+    global _response_cache
+    if _response_cache is None and config.get("aws.cache_ttl", 60) > 0:
+        with _response_cache_lock:
+            if _response_cache is None:
+                import diskcache
+
+                cache_dir = os.path.expanduser(
+                    config.get("aws.cache_dir", "~/.awschat/cache")
+                )
+                # Cached responses describe the account, so only the owner may read them
+                os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+                _response_cache = diskcache.Cache(cache_dir)
+    return _response_cache
+
+
+# Operations whose responses are too sensitive to write to disk, such as every
+# user's inline policy documents
+_DISK_UNCACHED_OPERATIONS = frozenset({"get_account_authorization_details"})
+
+
+def _credential_scope() -> str:
+    """Identify the credentials in use, so cached responses never cross accounts."""
+    credentials = _get_session().get_credentials()
+    access_key = credentials.access_key if credentials is not None else ""
+    return hashlib.blake2b(access_key.encode(), digest_size=16).hexdigest()
+
+
+def clear_response_cache() -> None:
+    """Remove all cached AWS responses."""
+    cache = _get_response_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    """Get the AWS error code of a failed call, if it has one."""
+    if isinstance(error, ClientError):
+        return error.response["Error"]["Code"]
+    return None
+
+
 class AWSClient:
     """Base AWS client with error handling and retry logic."""
 
-    def __init__(self, service_name: str, region: Optional[str] = None):
+    def __init__(
+        self,
+        service_name: str,
+        region: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_pool_connections: Optional[int] = None,
+        tcp_keepalive: bool = False,
+    ):
+        """
+        Create a client, with optional per-service overrides of the aws config.
+
+        Args:
+            service_name: The AWS service to create a client for
+            region: The AWS region, defaulting to aws.region
+            max_retries: Retry attempts, defaulting to aws.max_retries
+            connect_timeout: Connect timeout in seconds, defaulting to aws.timeout
+            read_timeout: Read timeout in seconds, defaulting to aws.timeout
+            max_pool_connections: HTTP connection pool size, defaulting to
+                aws.max_pool_connections
+            tcp_keepalive: Whether to enable TCP keep-alive on connections
+        """
+        timeout = config.get("aws.timeout", 30)
         self.service_name = service_name
         self.region = region or config.get("aws.region", "us-east-1")
-        self.max_retries = config.get("aws.max_retries", 3)
-        self.timeout = config.get("aws.timeout", 30)
+        self.max_retries = (
+            max_retries if max_retries is not None else config.get("aws.max_retries", 3)
+        )
+        self.connect_timeout = connect_timeout or timeout
+        self.read_timeout = read_timeout or timeout
+        self.max_pool_connections = max_pool_connections or config.get(
+            "aws.max_pool_connections", 50
+        )
+        self.tcp_keepalive = tcp_keepalive
         self.client = self._create_client()
 
-    def _create_client(self) -> boto3.client:
-        """Create AWS client with proper configuration."""
+    def _create_client(self) -> Any:
+        """Get or create a shared AWS client with proper configuration."""
+        options = (
+            self.max_retries,
+            self.connect_timeout,
+            self.read_timeout,
+            self.max_pool_connections,
+            self.tcp_keepalive,
+        )
+        key = (self.service_name, self.region, *options)
+
         try:
-            session = boto3.Session(region_name=self.region)
-            client_config = Config(
-                retries=dict(max_attempts=self.max_retries),
-                read_timeout=self.timeout,
-                connect_timeout=self.timeout,
-            )
-            client = session.client(self.service_name, config=client_config)
+            # boto3 sessions are not thread-safe, so creation is serialised
+            with _client_lock:
+                client = _client_cache.get(key)
+                if client is not None:
+                    return client
+
+                client = _get_session().client(
+                    self.service_name,
+                    region_name=self.region,
+                    config=_client_config(*options),
+                )
+                _client_cache[key] = client
 
             logger.info(
                 f"AWS {self.service_name} client created successfully",
@@ -73,10 +239,12 @@ class AWSClient:
             error_code = error.response["Error"]["Code"]
             error_message = error.response["Error"]["Message"]
 
+            # Expected error responses carry no useful stack, so skip the traceback
             logger.log_aws_error(
                 service=self.service_name,
                 operation=operation,
                 error=error,
+                include_traceback=error_code not in _EXPECTED_ERROR_CODES,
                 error_code=error_code,
                 error_message=error_message,
             )
@@ -111,73 +279,112 @@ class AWSClient:
             logger.log_aws_error(self.service_name, operation, error)
             return error_msg
 
+    def _log_execution(
+        self, operation: str, success: bool, start_time: float, **kwargs
+    ) -> None:
+        """Log the outcome and duration of an AWS operation."""
+        logger.log_tool_execution(
+            tool_name=f"{self.service_name}.{operation}",
+            success=success,
+            duration=time.time() - start_time,
+            **kwargs,
+        )
+
+    def _cache_key(self, operation: str, args: tuple, kwargs: dict) -> Optional[str]:
+        """
+        Build the response cache key for an operation and its arguments.
+
+        Returns:
+            The key, scoped to the current credentials, or None if the
+            operation's responses are not cached
+        """
+        if operation in _DISK_UNCACHED_OPERATIONS:
+            return None
+        digest = hashlib.blake2b(pickle.dumps((args, kwargs))).hexdigest()
+        return (
+            f"{_credential_scope()}:{self.service_name}:{self.region}:"
+            f"{operation}:{digest}"
+        )
+
+    def _cache_get(self, key: Optional[str]) -> Any:
+        """Fetch a cached response, or None on a miss or cache failure."""
+        if key is None:
+            return None
+        try:
+            cache = _get_response_cache()
+            return cache.get(key) if cache is not None else None
+        except Exception as e:
+            logger.warning(f"AWS response cache unavailable: {e}")
+            return None
+
+    def _cache_set(self, key: Optional[str], result: Any) -> None:
+        """Store a successful response in the cache."""
+        if key is None:
+            return
+        try:
+            cache = _get_response_cache()
+            if cache is not None:
+                cache.set(key, result, expire=config.get("aws.cache_ttl", 60))
+        except Exception as e:
+            logger.warning(f"Failed to cache AWS response: {e}")
+
+    def invalidate_cached(self, operation: str, *args, **kwargs) -> None:
+        """Drop the cached response of an operation called with these arguments."""
+        try:
+            key = self._cache_key(operation, args, kwargs)
+            cache = _get_response_cache()
+            if cache is not None and key is not None:
+                cache.delete(key)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached AWS response: {e}")
+
     def execute_with_retry(self, operation: str, func, *args, **kwargs) -> Any:
-        """Execute AWS operation with retry logic and error handling."""
+        """
+        Execute AWS operation with retry logic and error handling.
+
+        Raises:
+            AWSToolError: If the operation fails after botocore's retries, with
+                a user-friendly message
+        """
         start_time = time.time()
 
-        for attempt in range(self.max_retries + 1):
-            try:
-                logger.debug(
-                    f"Executing {operation} (attempt {attempt + 1}/{self.max_retries + 1})"
-                )
-                result = func(*args, **kwargs)
+        # Every operation wrapped here is read-only, so responses are cacheable
+        cache_key = self._cache_key(operation, args, kwargs)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            self._log_execution(operation, True, start_time, cache="hit")
+            return cached
 
-                duration = time.time() - start_time
-                logger.log_tool_execution(
-                    tool_name=f"{self.service_name}.{operation}",
-                    success=True,
-                    duration=duration,
-                )
+        # botocore's adaptive retry mode already retries throttling, server
+        # errors and connection failures; anything else will not succeed on retry
+        try:
+            logger.debug("Executing %s", operation)
+            result = func(*args, **kwargs)
+            self._log_execution(operation, True, start_time, cache="miss")
+            self._cache_set(cache_key, result)
+            return result
 
-                return result
-
-            except (
-                ClientError,
-                EndpointConnectionError,
-                ConnectTimeoutError,
-                ReadTimeoutError,
-            ) as e:
-                duration = time.time() - start_time
-
-                if isinstance(e, ClientError):
-                    error_code = e.response["Error"]["Code"]
-                    if error_code in [
-                        "AccessDenied",
-                        "NoSuchBucket",
-                        "NoSuchEntity",
-                        "ValidationError",
-                    ]:
-                        logger.log_tool_execution(
-                            tool_name=f"{self.service_name}.{operation}",
-                            success=False,
-                            duration=duration,
-                        )
-                        return self._handle_aws_error(e, operation)
-
-                if attempt < self.max_retries:
-                    wait_time = (2**attempt) * 1  # Exponential backoff
-                    logger.warning(
-                        f"Retrying {operation} in {wait_time}s (attempt {attempt + 1}/{self.max_retries + 1})",
-                        error=str(e),
-                    )
-                    time.sleep(wait_time)
-                else:
-                    logger.log_tool_execution(
-                        tool_name=f"{self.service_name}.{operation}",
-                        success=False,
-                        duration=duration,
-                    )
-                    return self._handle_aws_error(e, operation)
-
-            except Exception as e:
-                duration = time.time() - start_time
-                logger.log_tool_execution(
-                    tool_name=f"{self.service_name}.{operation}",
-                    success=False,
-                    duration=duration,
-                )
-                logger.error(f"Unexpected error in {operation}", exc_info=e)
-                return f"An unexpected error occurred: {str(e)}"
+        except _AWS_ERRORS as e:
+            self._log_execution(operation, False, start_time)
+            raise AWSToolError(
+                self._handle_aws_error(e, operation), code=_error_code(e)
+            ) from e
+
+        except Exception as e:
+            self._log_execution(operation, False, start_time)
+            logger.error(f"Unexpected error in {operation}", exc_info=e)
+            raise AWSToolError(f"An unexpected error occurred: {str(e)}") from e
+
+    def paginate(self, operation: str, **kwargs) -> Any:
+        """Execute a paginated operation and merge every page into one response."""
+        return self.execute_with_retry(
+            operation, self._paginate_all, operation, **kwargs
+        )
+
+    def _paginate_all(self, operation: str, **kwargs) -> Any:
+        """Fetch all pages of an operation using its boto3 paginator."""
+        paginator = self.client.get_paginator(operation)
+        return paginator.paginate(**kwargs).build_full_result()
 
     def test_connection(self) -> bool:
         """Test AWS connection and permissions."""
@@ -186,10 +393,12 @@ class AWSClient:
                 self.client.list_buckets()
             elif self.service_name == "iam":
                 self.client.list_users()
+            elif self.service_name == "ec2":
+                self.client.describe_instances(MaxResults=5)
             else:
                 self.client.meta.service_model.service_name
 
-            logger.debug(f"AWS {self.service_name} connection test successful")
+            logger.debug("AWS %s connection test successful", self.service_name)
             return True
 
         except Exception as e:
@@ -0,0 +1,42 @@
+"""
+LangChain callbacks for AWS Assistant.
+Provides callback handlers that report model usage telemetry.
+"""
+
+from typing import Any
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from logger import logger
+
+
+class PromptCacheUsageHandler(BaseCallbackHandler):
+    """Callback handler that logs provider prompt-cache hit rates."""
+
+    def __init__(self):
+        self.input_tokens = 0
+        self.cached_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """Record cached prompt tokens reported in the model usage metadata."""
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if not usage:
+                    continue
+
+                input_tokens = usage.get("input_tokens", 0)
+                cached = usage.get("input_token_details", {}).get("cache_read", 0)
+                self.input_tokens += input_tokens
+                self.cached_tokens += cached
+
+                hit_rate = (
+                    self.cached_tokens / self.input_tokens if self.input_tokens else 0
+                )
+                logger.info(
+                    f"Prompt cache: {cached}/{input_tokens} input tokens cached "
+                    f"(session hit rate {hit_rate:.0%})",
+                    cached_tokens=cached,
+                    input_tokens=input_tokens,
+                )
@@ -8,6 +8,12 @@ import yaml
 from typing import Dict, Any
 from pathlib import Path
 
+try:
+    # LibYAML's C loader is several times faster than the pure-Python one
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
 
 class ConfigManager:
     """Manages configuration settings for the AWS Assistant."""
@@ -16,6 +22,13 @@ class ConfigManager:
         self.config_path = Path(config_path)
         self.config = self._load_config()
         self._validate_config()
+        # Precomputed lookups so hot paths avoid walking the nested config
+        self._flat_config = self._flatten(self.config)
+        self._enabled_services = frozenset(
+            service
+            for service, enabled in self.get_services_config().items()
+            if enabled
+        )
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file."""
@@ -26,7 +39,7 @@ class ConfigManager:
                 )
 
             with open(self.config_path, "r") as file:
-                config = yaml.safe_load(file)
+                config = yaml.load(file, Loader=_YAMLLoader)
 
             if not config:
                 raise ValueError("Configuration file is empty")
@@ -45,17 +58,20 @@ class ConfigManager:
             if section not in self.config:
                 raise ValueError(f"Missing required configuration section: {section}")
 
+    @staticmethod
+    def _flatten(config: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        """Flatten nested configuration into dot-notation keys."""
+        flat = {}
+        for key, value in config.items():
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(ConfigManager._flatten(value, f"{path}."))
+        return flat
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation (e.g., 'openai.model')."""
-        keys = key.split(".")
-        value = self.config
-
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._flat_config.get(key, default)
 
     def get_openai_config(self) -> Dict[str, Any]:
         """Get OpenAI configuration."""
@@ -79,8 +95,7 @@ class ConfigManager:
 
     def is_service_enabled(self, service: str) -> bool:
         """Check if a specific AWS service is enabled."""
-        services = self.get_services_config()
-        return services.get(service, False)
+        return service in self._enabled_services
 
     def validate_environment(self) -> None:
         """Validate required environment variables."""
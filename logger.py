@@ -3,8 +3,10 @@ Logging configuration for AWS Assistant.
 Provides structured logging with file rotation and error tracking.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 
 from typing import Optional
@@ -26,11 +28,11 @@ class AWSAssistantLogger:
         if logger.handlers:
             return logger
 
-        logger.setLevel(logging.DEBUG)
-
         # Get logging configuration
         log_config = config.get_logging_config()
         log_level = getattr(logging, log_config.get("level", "INFO"))
+        # Matching the handler level lets isEnabledFor skip disabled records early
+        logger.setLevel(log_level)
         log_format = log_config.get(
             "format", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
@@ -54,58 +56,82 @@ class AWSAssistantLogger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers = [console_handler]
 
         # File handler with rotation
+        file_error = None
         try:
             file_handler = logging.handlers.RotatingFileHandler(
                 log_file, maxBytes=max_size, backupCount=backup_count
             )
             file_handler.setLevel(log_level)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except Exception as e:
-            logger.warning(f"Could not set up file logging: {e}")
+            file_error = e
+
+        # Emit through a background thread so callers never block on I/O
+        log_queue = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(log_level)
+        logger.addHandler(queue_handler)
+
+        self.listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+        if file_error:
+            logger.warning(f"Could not set up file logging: {file_error}")
 
         return logger
 
-    def debug(self, message: str, **kwargs) -> None:
-        """Log debug message."""
-        self.logger.debug(message, extra=kwargs)
+    def debug(self, message: str, *args, **kwargs) -> None:
+        """Log debug message, formatting args lazily."""
+        self.logger.debug(message, *args, extra=kwargs)
 
-    def info(self, message: str, **kwargs) -> None:
-        """Log info message."""
-        self.logger.info(message, extra=kwargs)
+    def info(self, message: str, *args, **kwargs) -> None:
+        """Log info message, formatting args lazily."""
+        self.logger.info(message, *args, extra=kwargs)
 
-    def warning(self, message: str, **kwargs) -> None:
-        """Log warning message."""
-        self.logger.warning(message, extra=kwargs)
+    def warning(self, message: str, *args, **kwargs) -> None:
+        """Log warning message, formatting args lazily."""
+        self.logger.warning(message, *args, extra=kwargs)
 
     def error(
-        self, message: str, exc_info: Optional[Exception] = None, **kwargs
+        self, message: str, *args, exc_info: Optional[Exception] = None, **kwargs
     ) -> None:
         """Log error message with optional exception info."""
         if exc_info:
-            self.logger.error(message, exc_info=exc_info, extra=kwargs)
+            self.logger.error(message, *args, exc_info=exc_info, extra=kwargs)
         else:
-            self.logger.error(message, extra=kwargs)
+            self.logger.error(message, *args, extra=kwargs)
 
     def critical(
-        self, message: str, exc_info: Optional[Exception] = None, **kwargs
+        self, message: str, *args, exc_info: Optional[Exception] = None, **kwargs
     ) -> None:
         """Log critical message with optional exception info."""
         if exc_info:
-            self.logger.critical(message, exc_info=exc_info, extra=kwargs)
+            self.logger.critical(message, *args, exc_info=exc_info, extra=kwargs)
         else:
-            self.logger.critical(message, extra=kwargs)
+            self.logger.critical(message, *args, extra=kwargs)
 
     def log_aws_error(
-        self, service: str, operation: str, error: Exception, **kwargs
+        self,
+        service: str,
+        operation: str,
+        error: Exception,
+        include_traceback: bool = True,
+        **kwargs,
     ) -> None:
         """Log AWS-specific errors with context."""
         self.error(
-            f"AWS {service} {operation} failed",
-            exc_info=error,
+            "AWS %s %s failed: %s",
+            service,
+            operation,
+            error,
+            exc_info=error if include_traceback else None,
             service=service,
             operation=operation,
             **kwargs,
@@ -116,10 +142,12 @@ class AWSAssistantLogger:
     ) -> None:
         """Log tool execution metrics."""
         level = logging.DEBUG if success else logging.ERROR
-        message = f"Tool {tool_name} executed {'successfully' if success else 'with error'} in {duration:.2f}s"
         self.logger.log(
             level,
-            message,
+            "Tool %s executed %s in %.2fs",
+            tool_name,
+            "successfully" if success else "with error",
+            duration,
             extra={
                 "tool_name": tool_name,
                 "success": success,
@@ -3,45 +3,69 @@ AWS Assistant - Main Entry Point.
 A user-friendly interface for the AWS Assistant agent.
 """
 
+import asyncio
 import sys
 import os
 import getpass
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 
+from config_manager import config
 from logger import logger
-from agent import agent
+
+
+_BANNER = "\n".join(
+    (
+        "",
+        "=" * 60,
+        "🤖 AWS Assistant - AI-Powered AWS Resource Manager",
+        "=" * 60,
+        "Type 'help' for available commands, 'exit' to quit",
+        "=" * 60,
+        "",
+        "",
+    )
+)
+
+_HELP = "\n".join(
+    (
+        "",
+        "📚 AWS Assistant Help",
+        "-" * 40,
+        "Available commands:",
+        "• help - Show this help message",
+        "• status - Check AWS connection status",
+        "• commands - List available AWS operations",
+        "• clear - Clear conversation context",
+        "• context - Show conversation context summary",
+        "• exit/quit - Exit the application",
+        "",
+        "Example queries:",
+        "• 'List all S3 buckets'",
+        "• 'Show me all IAM users'",
+        "• 'What's in my bucket named example-bucket?'",
+        "• 'Get details for IAM user john.doe'",
+        "• 'Find IAM users containing admin'",
+        "• 'Check for public S3 buckets'",
+        "",
+        "You can also ask natural language questions about your AWS resources!",
+        "",
+        "",
+    )
+)
 
 
 def print_banner() -> None:
     """Print the application banner."""
-    print("\n" + "=" * 60)
-    print("🤖 AWS Assistant - AI-Powered AWS Resource Manager")
-    print("=" * 60)
-    print("Type 'help' for available commands, 'exit' to quit")
-    print("=" * 60 + "\n")
+    sys.stdout.write(_BANNER)
 
 
 def print_help() -> None:
     """Print help information."""
-    print("\n📚 AWS Assistant Help")
-    print("-" * 40)
-    print("Available commands:")
-    print("• help - Show this help message")
-    print("• status - Check AWS connection status")
-    print("• commands - List available AWS operations")
-    print("• clear - Clear conversation context")
-    print("• context - Show conversation context summary")
-    print("• exit/quit - Exit the application")
-    print("\nExample queries:")
-    print("• 'List all S3 buckets'")
-    print("• 'Show me all IAM users'")
-    print("• 'What's in my bucket named example-bucket?'")
-    print("• 'Get details for IAM user john.doe'")
-    print("• 'Find IAM users containing admin'")
-    print("• 'Check for public S3 buckets'")
-    print("\nYou can also ask natural language questions about your AWS resources!\n")
-
-
-def print_status() -> None:
+    sys.stdout.write(_HELP)
+
+
+def print_status(agent) -> None:
     """Print the current status of AWS connections."""
     print("\n🔍 Checking AWS Connection Status...")
 
@@ -67,21 +91,45 @@ def print_status() -> None:
         print()
 
 
-def print_commands() -> None:
+def print_commands(agent) -> None:
     """Print available AWS commands."""
     print("\n🛠️  Available AWS Operations:")
     print("-" * 40)
 
     try:
         commands = agent.get_available_commands()
-        for command in commands:
-            print(command)
-        print()
+        sys.stdout.write("".join(f"{command}\n" for command in commands) + "\n")
     except Exception as e:
         print(f"❌ Error getting commands: {e}")
         print()
 
 
+def clear_context(agent) -> None:
+    """Clear the conversation context."""
+    agent.clear_context()
+    print("🧹 Conversation history cleared.")
+
+
+def print_context(agent) -> None:
+    """Print a summary of the conversation context."""
+    print(agent.get_context_summary())
+
+
+async def stream_response(agent, query: str) -> None:
+    """Print the agent's response as it is generated."""
+    print("\n💬 Response:")
+    async for chunk in agent.arun_stream(query):
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    print()
+
+
+@lru_cache(maxsize=1)
+def _aws_credentials_file_exists() -> bool:
+    """Check once whether the shared AWS credentials file exists."""
+    return os.path.exists(os.path.expanduser("~/.aws/credentials"))
+
+
 def setup_environment() -> bool:
     """Set up the environment with required credentials."""
     print("🔧 Setting up AWS Assistant...")
@@ -104,7 +152,7 @@ def setup_environment() -> bool:
     aws_configured = (
         os.environ.get("AWS_ACCESS_KEY_ID")
         or os.environ.get("AWS_PROFILE")
-        or os.path.exists(os.path.expanduser("~/.aws/credentials"))
+        or _aws_credentials_file_exists()
     )
 
     if not aws_configured:
@@ -130,51 +178,63 @@ def main() -> None:
 
         try:
             print("🚀 Initializing AWS Assistant...")
+            # Imported here so the banner and key prompt appear without waiting
+            # for LangChain and boto3 to load
+            from agent import agent
+
             print("✅ AWS Assistant ready!")
         except Exception as e:
             print(f"❌ Failed to initialize AWS Assistant: {e}")
             print("Please check your configuration and try again.")
             return
 
-        while True:
-            try:
-                query = input("\n🤖 Ask AWS Assistant: ").strip()
-
-                if query.lower() in ["exit", "quit"]:
-                    print("\n👋 Goodbye! Thanks for using AWS Assistant.")
+        # Built-in commands, matched case-insensitively against the whole input
+        commands = {
+            "help": print_help,
+            "status": partial(print_status, agent),
+            "commands": partial(print_commands, agent),
+            "clear": partial(clear_context, agent),
+            "context": partial(print_context, agent),
+        }
+
+        # One event loop for the session so async HTTP clients stay usable
+        with asyncio.Runner() as runner:
+            # Tool calls from one agent step are gathered and each blocking
+            # boto3 call runs on the loop's default executor, so size it for
+            # concurrent AWS requests rather than CPU count
+            runner.get_loop().set_default_executor(
+                ThreadPoolExecutor(
+                    max_workers=config.get("agent.tool_workers", 16),
+                    thread_name_prefix="aws-tool",
+                )
+            )
+            while True:
+                try:
+                    query = input("\n🤖 Ask AWS Assistant: ").strip()
+                    command = query.casefold()
+
+                    if command in ("exit", "quit"):
+                        print("\n👋 Goodbye! Thanks for using AWS Assistant.")
+                        break
+                    elif not query:
+                        print("Please enter a query or type 'help' for assistance.")
+                        continue
+
+                    handler = commands.get(command)
+                    if handler:
+                        handler()
+                        continue
+
+                    print("\n🔄 Processing your request...")
+                    runner.run(stream_response(agent, query))
+
+                except KeyboardInterrupt:
+                    print("\n\n👋 Goodbye! Thanks for using AWS Assistant.")
                     break
-                elif query.lower() == "help":
-                    print_help()
-                    continue
-                elif query.lower() == "status":
-                    print_status()
-                    continue
-                elif query.lower() == "commands":
-                    print_commands()
-                    continue
-                elif query.lower() == "clear":
-                    agent.clear_context()
-                    print("🧹 Conversation history cleared.")
-                    continue
-                elif query.lower() == "context":
-                    print(agent.get_context_summary())
-                    continue
-                elif not query:
-                    print("Please enter a query or type 'help' for assistance.")
-                    continue
-
-                print("\n🔄 Processing your request...")
-                response = agent.run(query)
-
-                print(f"\n💬 Response:\n{response}")
-
-            except KeyboardInterrupt:
-                print("\n\n👋 Goodbye! Thanks for using AWS Assistant.")
-                break
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}", exc_info=e)
-                print(f"\n❌ An error occurred: {e}")
-                print("Please try again or type 'help' for assistance.")
+                except Exception as e:
+                    logger.error(f"Error in main loop: {e}", exc_info=e)
+                    print(f"\n❌ An error occurred: {e}")
+                    print("Please try again or type 'help' for assistance.")
 
     except Exception as e:
         logger.critical(f"Critical error in main: {e}", exc_info=e)
@@ -0,0 +1,100 @@
+"""
+Response caching for AWS Assistant.
+Provides a semantic cache that serves stored answers for similar queries.
+"""
+
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+
+class SemanticCache:
+    """Embedding-keyed response cache with TTL and LRU eviction."""
+
+    def __init__(
+        self, threshold: float = 0.92, max_entries: int = 512, ttl: float = 60
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Rows are L2-normalised so a single matmul yields cosine similarities
+        self._matrix: Optional[np.ndarray] = None
+        self._created = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._queries: List[Optional[str]] = [None] * max_entries
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._size = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expired(self, now: float) -> np.ndarray:
+        """Return a mask of populated slots whose TTL has elapsed."""
+        return self._created[: self._size] < now - self.ttl
+
+    def get(self, embedding: List[float]) -> Optional[str]:
+        """
+        Look up a cached response for a query embedding.
+
+        Args:
+            embedding: The embedding of the incoming query
+
+        Returns:
+            The cached response if a similar query was found, otherwise None
+        """
+        with self._lock:
+            if not self._size:
+                return None
+
+            now = time.time()
+            sims = self._matrix[: self._size] @ self._normalize(embedding)
+            sims[self._expired(now)] = -np.inf
+
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+
+            self._last_used[best] = now
+            return self._responses[best]
+
+    def put(self, embedding: List[float], query: str, response: str) -> None:
+        """Store a response for a query embedding."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros(
+                    (self.max_entries, vector.shape[0]), dtype=np.float32
+                )
+
+            now = time.time()
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                # Reuse an expired slot first, otherwise the least recently used
+                last_used = self._last_used.copy()
+                last_used[self._expired(now)] = -np.inf
+                slot = int(np.argmin(last_used))
+
+            self._matrix[slot] = vector
+            self._created[slot] = now
+            self._last_used[slot] = now
+            self._queries[slot] = query
+            self._responses[slot] = response
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._size = 0
+            self._queries = [None] * self.max_entries
+            self._responses = [None] * self.max_entries
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,53 @@
+"""
+Tool selection for AWS Assistant.
+Narrows the tools sent with each request to those relevant to the query.
+"""
+
+from typing import Any, List, Optional
+
+import numpy as np
+
+
+class ToolSelector:
+    """Selects the tools most similar to a query by embedding similarity."""
+
+    def __init__(
+        self,
+        tools: List[Any],
+        tool_embeddings: List[List[float]],
+        top_k: int = 6,
+        min_similarity: float = 0.2,
+    ):
+        self.tools = tools
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        matrix = np.asarray(tool_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        self._matrix = matrix / norms
+
+    def select(self, query_embedding: List[float]) -> Optional[List[Any]]:
+        """
+        Select the tools relevant to a query.
+
+        Args:
+            query_embedding: The embedding of the user's query
+
+        Returns:
+            The top-k tools in their original order, or None if no tool is
+            similar enough and the full tool set should be used instead
+        """
+        if len(self.tools) <= self.top_k:
+            return None
+
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+
+        sims = self._matrix @ (vector / norm)
+        if sims.max() < self.min_similarity:
+            return None
+
+        top = np.argpartition(sims, -self.top_k)[-self.top_k :]
+        return [self.tools[i] for i in sorted(top)]
@@ -0,0 +1,15 @@
+"""
+AWS tools for AWS Assistant.
+Provides the thread pool shared by tools that issue AWS calls concurrently.
+"""
+
+import atexit
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# One bounded pool for every tool fan-out, kept below the per-client
+# connection pool so concurrent calls never wait on a socket
+AWS_POOL = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 4), thread_name_prefix="aws-tool"
+)
+atexit.register(AWS_POOL.shutdown, wait=False)
@@ -0,0 +1,54 @@
+"""
+In-memory TTL cache for AWS tool clients.
+Holds results that are derived from several AWS calls, or too sensitive for
+the on-disk response cache, for aws.cache_ttl seconds.
+"""
+
+import threading
+import time
+from functools import wraps
+from typing import Any, Dict, Tuple
+from config_manager import config
+
+_cache: Dict[Tuple, Tuple[float, Any]] = {}
+_lock = threading.Lock()
+
+
+def ttl_cache(func):
+    """Cache a function's results for aws.cache_ttl seconds, keyed by its arguments."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        ttl = config.get("aws.cache_ttl", 60)
+        if ttl <= 0:
+            return func(*args, **kwargs)
+
+        # kwargs may hold unhashable values such as EC2 filter lists
+        key = (func.__qualname__, args, repr(sorted(kwargs.items())))
+        now = time.monotonic()
+
+        with _lock:
+            entry = _cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        # Failed calls raise, so only successful results are cached
+        value = func(*args, **kwargs)
+        with _lock:
+            _cache[key] = (now + ttl, value)
+        return value
+
+    def cache_clear() -> None:
+        """Remove this function's cached results."""
+        with _lock:
+            for key in [key for key in _cache if key[0] == func.__qualname__]:
+                del _cache[key]
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def clear() -> None:
+    """Remove all cached results."""
+    with _lock:
+        _cache.clear()
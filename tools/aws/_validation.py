@@ -0,0 +1,34 @@
+"""
+Input validation for AWS tools.
+Checks required string arguments before a tool runs.
+"""
+
+import inspect
+from functools import wraps
+
+
+def require_nonempty(**labels: str):
+    """
+    Reject blank string arguments and strip surrounding whitespace.
+
+    Args:
+        labels: Maps each argument name to how it is described to the user,
+            e.g. instance_id="instance ID"
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            for name, label in labels.items():
+                value = (bound.arguments.get(name) or "").strip()
+                if not value:
+                    return f"Please provide a valid {label}."
+                bound.arguments[name] = value
+            return func(*bound.args, **bound.kwargs)
+
+        return wrapper
+
+    return decorator
@@ -3,10 +3,46 @@ EC2 tools for AWS Assistant.
 Provides tools for EC2 operations with formatted responses.
 """
 
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime
+from itertools import chain
+from typing import List
 from langchain_core.tools import tool
-from aws_client import AWSClient
+from aws_client import AWSClient, AWSToolError
+from config_manager import config
 from logger import logger
+from tools.aws._validation import require_nonempty
+
+# DescribeInstances accepts at most 1000 instance IDs per request
+MAX_INSTANCE_IDS = 1000
+
+# Errors caused by a single bad ID, which fail the whole DescribeInstances call
+_INVALID_INSTANCE_ID_CODES = frozenset(
+    {"InvalidInstanceID.NotFound", "InvalidInstanceID.Malformed"}
+)
+
+
+def _iter_instances(response):
+    """Iterate over every instance in a DescribeInstances response."""
+    return chain.from_iterable(
+        reservation.get("Instances", ())
+        for reservation in response.get("Reservations", ())
+    )
+
+
+def _instance_name(instance) -> str:
+    """Get an instance's Name tag, or "Unnamed" if it has none."""
+    return next(
+        (
+            tag.get("Value", "Unnamed")
+            for tag in instance.get("Tags", ())
+            if tag.get("Key") == "Name"
+        ),
+        "Unnamed",
+    )
 
 
 class EC2Client(AWSClient):
@@ -14,20 +50,37 @@ class EC2Client(AWSClient):
 
     def __init__(self, region: str = None):
         super().__init__("ec2", region)
+        self._batcher = None
+        self._batcher_lock = threading.Lock()
 
     def describe_instances(self, **kwargs):
-        """Describe EC2 instances."""
-        return self.execute_with_retry(
-            "describe_instances", self.client.describe_instances, **kwargs
-        )
-
-    def describe_instance(self, instance_id: str):
-        """Describe a specific EC2 instance."""
-        return self.execute_with_retry(
-            "describe_instances",
-            self.client.describe_instances,
-            InstanceIds=[instance_id],
-        )
+        """Describe EC2 instances across every page of results."""
+        return self.paginate("describe_instances", **kwargs)
+
+    def describe_instances_batch(self, instance_ids: List[str]):
+        """Describe many instances in as few DescribeInstances calls as possible."""
+        reservations = []
+        for start in range(0, len(instance_ids), MAX_INSTANCE_IDS):
+            response = self.paginate(
+                "describe_instances",
+                InstanceIds=instance_ids[start : start + MAX_INSTANCE_IDS],
+            )
+            reservations.extend(response.get("Reservations", []))
+        return {"Reservations": reservations}
+
+    def lookup_instance(self, instance_id: str):
+        """
+        Look up a single instance, coalescing concurrent lookups into one call.
+
+        Returns:
+            The instance description, or None if it was not found
+        """
+        with self._batcher_lock:
+            if self._batcher is None:
+                self._batcher = _InstanceBatcher(
+                    self, config.get("aws.ec2_batch_window", 0.05)
+                )
+        return self._batcher.submit(instance_id).result()
 
     def describe_security_groups(self, **kwargs):
         """Describe security groups."""
@@ -36,46 +89,142 @@ class EC2Client(AWSClient):
         )
 
 
+class _InstanceBatcher:
+    """Batches single-instance lookups issued within a short window."""
+
+    def __init__(self, client: EC2Client, max_delay: float):
+        self.client = client
+        self.max_delay = max_delay
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="ec2-describe-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, instance_id: str) -> Future:
+        """Queue an instance lookup and return a future for its result."""
+        future = Future()
+        with self._cond:
+            self._pending.append((instance_id, future))
+            self._cond.notify()
+        return future
+
+    def _run(self) -> None:
+        """Flush pending lookups once the window closes or the batch is full."""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+
+                deadline = time.monotonic() + self.max_delay
+                while len(self._pending) < MAX_INSTANCE_IDS:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = [
+                    self._pending.popleft()
+                    for _ in range(min(len(self._pending), MAX_INSTANCE_IDS))
+                ]
+
+            try:
+                self._flush(batch)
+            except Exception as e:
+                logger.error("Error flushing EC2 instance lookups", exc_info=e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _flush(self, batch) -> None:
+        """Describe a batch of instances and hand each caller its result."""
+        instance_ids = list(dict.fromkeys(instance_id for instance_id, _ in batch))
+        try:
+            response = self.client.describe_instances_batch(instance_ids)
+        except AWSToolError as e:
+            # Throttling, permission and network errors would fail every
+            # individual lookup too, so they are passed straight to each caller
+            if len(instance_ids) == 1 or e.code not in _INVALID_INSTANCE_ID_CODES:
+                for _, future in batch:
+                    future.set_exception(e)
+                return
+
+            # One unknown or malformed ID fails the whole request, so fall back
+            # to individual lookups to give every caller an accurate answer
+            for instance_id, future in batch:
+                try:
+                    single = self.client.describe_instances_batch([instance_id])
+                except AWSToolError as single_error:
+                    future.set_exception(single_error)
+                else:
+                    future.set_result(_first_instance(single))
+            return
+
+        instances = {
+            instance.get("InstanceId"): instance
+            for instance in _iter_instances(response)
+        }
+        for instance_id, future in batch:
+            future.set_result(instances.get(instance_id))
+
+
+def _first_instance(response):
+    """Return the first instance in a DescribeInstances response, or None."""
+    return next(_iter_instances(response), None)
+
+
 # Global EC2 client instance - will be initialized when needed
 ec2_client = None
+_ec2_client_lock = threading.Lock()
 
 
 def _get_ec2_client():
     """Get or create EC2 client instance."""
     global ec2_client
+    # Tools run on worker threads, so creation is locked to avoid duplicates
     if ec2_client is None:
-        ec2_client = EC2Client()
+        with _ec2_client_lock:
+            if ec2_client is None:
+                ec2_client = EC2Client()
     return ec2_client
 
 
-def _format_instance_info(instance):
-    """Format instance information for display."""
+def _format_launch_time(launch_time) -> str:
+    """Format an instance launch time for display."""
+    if isinstance(launch_time, datetime):
+        # AWS timestamps are UTC; dropping tzinfo keeps "+00:00" out of the output
+        return (
+            launch_time.replace(tzinfo=None).isoformat(sep=" ", timespec="seconds")
+            + " UTC"
+        )
+    return str(launch_time) if launch_time else "Unknown"
+
+
+def _format_instance_line(instance, *details: str) -> str:
+    """Format an instance as a one-line summary followed by the given details."""
+    return " - ".join(
+        (
+            f"{instance.get('InstanceId', 'Unknown')} ({_instance_name(instance)})",
+            instance.get("InstanceType", "Unknown"),
+            *details,
+        )
+    )
+
+
+def _extract_instance_fields(instance):
+    """Extract the fields shown in instance details."""
     instance_id = instance.get("InstanceId", "Unknown")
     state = instance.get("State", {}).get("Name", "Unknown")
     instance_type = instance.get("InstanceType", "Unknown")
-    launch_time = instance.get("LaunchTime")
     private_ip = instance.get("PrivateIpAddress", "N/A")
 
-    # Get instance name from tags
-    name = "Unnamed"
-    if "Tags" in instance:
-        for tag in instance["Tags"]:
-            if tag.get("Key") == "Name":
-                name = tag.get("Value", "Unnamed")
-                break
-
-    # Format launch time
-    if isinstance(launch_time, datetime):
-        launch_time_str = launch_time.strftime("%Y-%m-%d %H:%M:%S UTC")
-    else:
-        launch_time_str = str(launch_time) if launch_time else "Unknown"
-
     return {
         "id": instance_id,
-        "name": name,
+        "name": _instance_name(instance),
         "state": state,
         "type": instance_type,
-        "launch_time": launch_time_str,
+        "launch_time": _format_launch_time(instance.get("LaunchTime")),
         "private_ip": private_ip,
     }
 
@@ -90,30 +239,35 @@ def list_ec2_instances() -> str:
         client = _get_ec2_client()
         response = client.describe_instances()
 
-        if isinstance(response, str):  # Error response
-            return response
-
-        instances = []
-        for reservation in response.get("Reservations", []):
-            for instance in reservation.get("Instances", []):
-                instance_info = _format_instance_info(instance)
-                instances.append(
-                    f"{instance_info['id']} ({instance_info['name']}) - "
-                    f"{instance_info['type']} - {instance_info['state']} - "
-                    f"Launched: {instance_info['launch_time']}"
+        if not response.get("Reservations"):
+            return "No EC2 instances found in your AWS account."
+
+        # str.join materialises a generator anyway, so a list comprehension is faster
+        instances = "; ".join(
+            [
+                _format_instance_line(
+                    instance,
+                    instance.get("State", {}).get("Name", "Unknown"),
+                    f"Launched: {_format_launch_time(instance.get('LaunchTime'))}",
                 )
+                for instance in _iter_instances(response)
+            ]
+        )
 
         if not instances:
             return "No EC2 instances found in your AWS account."
 
-        return f"EC2 instances: {'; '.join(instances)}."
+        return f"EC2 instances: {instances}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error("Error in list_ec2_instances", exc_info=e)
         return f"Failed to list EC2 instances: {str(e)}"
 
 
 @tool
+@require_nonempty(instance_id="instance ID")
 def get_ec2_instance_details(instance_id: str) -> str:
     """
     Gets detailed information about a specific EC2 instance.
@@ -123,26 +277,16 @@ def get_ec2_instance_details(instance_id: str) -> str:
     """
     try:
         logger.debug(
-            f"Executing get_ec2_instance_details tool for instance: {instance_id}"
+            "Executing get_ec2_instance_details tool for instance: %s", instance_id
         )
 
-        if not instance_id or not instance_id.strip():
-            return "Please provide a valid instance ID."
-
-        instance_id = instance_id.strip()
         client = _get_ec2_client()
-        response = client.describe_instance(instance_id)
-
-        if isinstance(response, str):  # Error response
-            return response
+        instance = client.lookup_instance(instance_id)
 
-        instances = response.get("Reservations", [{}])[0].get("Instances", [])
-
-        if not instances:
+        if not instance:
             return f"Instance {instance_id} not found."
 
-        instance = instances[0]
-        instance_info = _format_instance_info(instance)
+        instance_info = _extract_instance_fields(instance)
 
         # Get additional details
         security_groups = [
@@ -168,9 +312,11 @@ def get_ec2_instance_details(instance_id: str) -> str:
 
         return "\n".join(result)
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error(
-            f"Error in get_ec2_instance_details for instance {instance_id}", exc_info=e
+            "Error in get_ec2_instance_details for instance %s", instance_id, exc_info=e
         )
         return f"Failed to get details for instance {instance_id}: {str(e)}"
 
@@ -187,71 +333,65 @@ def list_running_ec2_instances() -> str:
             Filters=[{"Name": "instance-state-name", "Values": ["running"]}]
         )
 
-        if isinstance(response, str):  # Error response
-            return response
+        if not response.get("Reservations"):
+            return "No running EC2 instances found."
 
-        instances = []
-        for reservation in response.get("Reservations", []):
-            for instance in reservation.get("Instances", []):
-                instance_info = _format_instance_info(instance)
-                instances.append(
-                    f"{instance_info['id']} ({instance_info['name']}) - "
-                    f"{instance_info['type']} - {instance_info['private_ip']}"
-                )
+        instances = "; ".join(
+            [
+                _format_instance_line(instance, instance.get("PrivateIpAddress", "N/A"))
+                for instance in _iter_instances(response)
+            ]
+        )
 
         if not instances:
             return "No running EC2 instances found."
 
-        return f"Running EC2 instances: {'; '.join(instances)}."
+        return f"Running EC2 instances: {instances}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error("Error in list_running_ec2_instances", exc_info=e)
         return f"Failed to list running EC2 instances: {str(e)}"
 
 
 @tool
+@require_nonempty(search_term="search term")
 def search_ec2_instances(search_term: str) -> str:
     """
-    Searches for EC2 instances by name or ID.
+    Searches for EC2 instances by name or ID. Name matching is case-sensitive.
 
     Args:
-        search_term: The search term to match against instance names or IDs
+        search_term: The search term to match against instance names or IDs,
+            in the same case as the instance's Name tag
     """
     try:
         logger.debug(
-            f"Executing search_ec2_instances tool with search term: {search_term}"
+            "Executing search_ec2_instances tool with search term: %s", search_term
         )
 
-        if not search_term or not search_term.strip():
-            return "Please provide a valid search term."
-
-        search_term = search_term.strip().lower()
         client = _get_ec2_client()
-        response = client.describe_instances()
 
-        if isinstance(response, str):  # Error response
-            return response
-
-        matching_instances = []
-        for reservation in response.get("Reservations", []):
-            for instance in reservation.get("Instances", []):
-                instance_id = instance.get("InstanceId", "").lower()
-
-                # Check instance name from tags
-                instance_name = ""
-                if "Tags" in instance:
-                    for tag in instance["Tags"]:
-                        if tag.get("Key") == "Name":
-                            instance_name = tag.get("Value", "").lower()
-                            break
-
-                # Check if search term matches
-                if search_term in instance_id or search_term in instance_name:
-                    instance_info = _format_instance_info(instance)
-                    matching_instances.append(
-                        f"{instance_info['id']} ({instance_info['name']}) - "
-                        f"{instance_info['type']} - {instance_info['state']}"
-                    )
+        # Let EC2 do the matching; filters support wildcards but are
+        # case-sensitive, and instance IDs are always lowercase
+        by_name = client.describe_instances(
+            Filters=[{"Name": "tag:Name", "Values": [f"*{search_term}*"]}]
+        )
+
+        by_id = client.describe_instances(
+            Filters=[{"Name": "instance-id", "Values": [f"*{search_term.lower()}*"]}]
+        )
+
+        matches = {}
+        for instance in chain(_iter_instances(by_name), _iter_instances(by_id)):
+            matches.setdefault(instance.get("InstanceId"), instance)
+
+        matching_instances = [
+            _format_instance_line(
+                instance, instance.get("State", {}).get("Name", "Unknown")
+            )
+            for instance in matches.values()
+        ]
 
         if not matching_instances:
             return f"No EC2 instances found matching '{search_term}'."
@@ -260,8 +400,10 @@ def search_ec2_instances(search_term: str) -> str:
             f"EC2 instances matching '{search_term}': {'; '.join(matching_instances)}."
         )
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error(
-            f"Error in search_ec2_instances with search term {search_term}", exc_info=e
+            "Error in search_ec2_instances with search term %s", search_term, exc_info=e
         )
         return f"Failed to search EC2 instances: {str(e)}"
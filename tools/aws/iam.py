@@ -3,9 +3,16 @@ IAM tools for AWS Assistant.
 Provides tools for IAM operations.
 """
 
+import threading
 from langchain_core.tools import tool
-from aws_client import AWSClient
+from aws_client import AWSClient, AWSToolError
 from logger import logger
+from tools.aws import AWS_POOL
+from tools.aws._cache import ttl_cache
+from tools.aws._validation import require_nonempty
+
+# IAM list calls return at most 100 items by default; 1000 is the maximum page
+_PAGE_CONFIG = {"PageSize": 1000}
 
 
 class IAMClient(AWSClient):
@@ -14,21 +21,48 @@ class IAMClient(AWSClient):
     def __init__(self, region: str = None):
         super().__init__("iam", region)
 
-    def list_users(self):
-        """List all IAM users."""
-        return self.execute_with_retry("list_users", self.client.list_users)
+    def list_users(self, **kwargs):
+        """List all IAM users across every page of results."""
+        return self.paginate("list_users", PaginationConfig=_PAGE_CONFIG, **kwargs)
 
     def list_groups(self):
-        """List all IAM groups."""
-        return self.execute_with_retry("list_groups", self.client.list_groups)
+        """List all IAM groups across every page of results."""
+        return self.paginate("list_groups", PaginationConfig=_PAGE_CONFIG)
 
     def list_policies(self):
-        """List all IAM policies."""
-        return self.execute_with_retry("list_policies", self.client.list_policies)
+        """List all IAM policies across every page of results."""
+        return self.paginate("list_policies", PaginationConfig=_PAGE_CONFIG)
 
     def list_roles(self):
-        """List all IAM roles."""
-        return self.execute_with_retry("list_roles", self.client.list_roles)
+        """List all IAM roles across every page of results."""
+        return self.paginate("list_roles", PaginationConfig=_PAGE_CONFIG)
+
+    # Authorization details are kept out of the disk cache, so they are held here
+    @ttl_cache
+    def user_details_by_name(self):
+        """
+        Map every IAM user name to its groups and policies in a few calls.
+
+        Returns:
+            The user's GetAccountAuthorizationDetails entry, with the
+            PasswordLastUsed field from ListUsers added
+        """
+        details = self.paginate(
+            "get_account_authorization_details",
+            Filter=["User"],
+            PaginationConfig=_PAGE_CONFIG,
+        )
+        # Authorization details omit PasswordLastUsed, which ListUsers includes
+        last_used = {
+            user["UserName"]: user.get("PasswordLastUsed")
+            for user in self.list_users().get("Users", [])
+        }
+        return {
+            detail["UserName"]: dict(
+                detail, PasswordLastUsed=last_used.get(detail["UserName"])
+            )
+            for detail in details.get("UserDetailList", [])
+        }
 
     def get_user(self, username: str):
         """Get specific IAM user details."""
@@ -59,16 +93,35 @@ class IAMClient(AWSClient):
 
 # Global IAM client instance - will be initialized when needed
 iam_client = None
+_iam_client_lock = threading.Lock()
 
 
 def _get_iam_client():
     """Get or create IAM client instance."""
     global iam_client
+    # Tools run on worker threads, so creation is locked to avoid duplicates
     if iam_client is None:
-        iam_client = IAMClient()
+        with _iam_client_lock:
+            if iam_client is None:
+                iam_client = IAMClient()
     return iam_client
 
 
+def _format_timestamp(timestamp) -> str:
+    """Format an AWS timestamp, which is always in UTC, for display."""
+    return (
+        timestamp.replace(tzinfo=None).isoformat(sep=" ", timespec="seconds") + " UTC"
+    )
+
+
+def _result_or_none(future):
+    """Return the result of an AWS call, or None if it failed."""
+    try:
+        return future.result()
+    except AWSToolError:
+        return None
+
+
 @tool
 def list_iam_users() -> str:
     """
@@ -79,9 +132,6 @@ def list_iam_users() -> str:
         client = _get_iam_client()
         response = client.list_users()
 
-        if isinstance(response, str):  # Error response
-            return response
-
         users = response.get("Users", [])
 
         if not users:
@@ -90,6 +140,8 @@ def list_iam_users() -> str:
         user_names = [user["UserName"] for user in users]
         return f"IAM users: {', '.join(user_names)}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error("Error in list_iam_users", exc_info=e)
         return f"Failed to list IAM users: {str(e)}"
@@ -105,9 +157,6 @@ def list_iam_groups() -> str:
         client = _get_iam_client()
         response = client.list_groups()
 
-        if isinstance(response, str):  # Error response
-            return response
-
         groups = response.get("Groups", [])
 
         if not groups:
@@ -116,6 +165,8 @@ def list_iam_groups() -> str:
         group_names = [group["GroupName"] for group in groups]
         return f"IAM groups: {', '.join(group_names)}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error("Error in list_iam_groups", exc_info=e)
         return f"Failed to list IAM groups: {str(e)}"
@@ -131,9 +182,6 @@ def list_iam_policies() -> str:
         client = _get_iam_client()
         response = client.list_policies()
 
-        if isinstance(response, str):  # Error response
-            return response
-
         policies = response.get("Policies", [])
 
         if not policies:
@@ -142,6 +190,8 @@ def list_iam_policies() -> str:
         policy_names = [policy["PolicyName"] for policy in policies]
         return f"IAM policies: {', '.join(policy_names)}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error("Error in list_iam_policies", exc_info=e)
         return f"Failed to list IAM policies: {str(e)}"
@@ -157,9 +207,6 @@ def list_iam_roles() -> str:
         client = _get_iam_client()
         response = client.list_roles()
 
-        if isinstance(response, str):  # Error response
-            return response
-
         roles = response.get("Roles", [])
 
         if not roles:
@@ -168,12 +215,84 @@ def list_iam_roles() -> str:
         role_names = [role["RoleName"] for role in roles]
         return f"IAM roles: {', '.join(role_names)}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error("Error in list_iam_roles", exc_info=e)
         return f"Failed to list IAM roles: {str(e)}"
 
 
+def _cached_user_details(client, username: str):
+    """
+    Look up a user's details in the cached account authorization details.
+
+    Returns:
+        A (user, groups, inline policies, attached policies) tuple, or None if
+        the user is not in the cache or it could not be loaded
+    """
+    try:
+        detail = client.user_details_by_name().get(username)
+    except AWSToolError as e:
+        # Requires iam:GetAccountAuthorizationDetails; fall back to per-user calls
+        logger.debug("Account authorization details unavailable: %s", e)
+        return None
+
+    if detail is None:
+        return None
+
+    return (
+        detail,
+        detail.get("GroupList", []),
+        [policy["PolicyName"] for policy in detail.get("UserPolicyList", [])],
+        [policy["PolicyName"] for policy in detail.get("AttachedManagedPolicies", [])],
+    )
+
+
+def _fetch_user_details(client, username: str):
+    """
+    Fetch a user's details with individual IAM calls.
+
+    Returns:
+        A (user, groups, inline policies, attached policies) tuple
+    """
+    # The four lookups are independent, so they are issued concurrently
+    user_future = AWS_POOL.submit(client.get_user, username)
+    groups_future = AWS_POOL.submit(client.list_user_groups, username)
+    inline_policies_future = AWS_POOL.submit(client.list_user_policies, username)
+    attached_policies_future = AWS_POOL.submit(
+        client.list_attached_user_policies, username
+    )
+
+    user_response = user_future.result()
+
+    user = user_response.get("User", {})
+
+    # Get user groups
+    groups_response = _result_or_none(groups_future)
+    groups = []
+    if groups_response is not None:
+        groups = [group["GroupName"] for group in groups_response.get("Groups", [])]
+
+    # Get inline policies
+    inline_policies_response = _result_or_none(inline_policies_future)
+    inline_policies = []
+    if inline_policies_response is not None:
+        inline_policies = inline_policies_response.get("PolicyNames", [])
+
+    # Get attached policies
+    attached_policies_response = _result_or_none(attached_policies_future)
+    attached_policies = []
+    if attached_policies_response is not None:
+        attached_policies = [
+            policy["PolicyName"]
+            for policy in attached_policies_response.get("AttachedPolicies", [])
+        ]
+
+    return user, groups, inline_policies, attached_policies
+
+
 @tool
+@require_nonempty(username="username")
 def get_iam_user_details(username: str) -> str:
     """
     Gets detailed information about a specific IAM user including groups and policies.
@@ -182,55 +301,23 @@ def get_iam_user_details(username: str) -> str:
         username: The name of the IAM user to get details for
     """
     try:
-        logger.debug(f"Executing get_iam_user_details tool for user: {username}")
-
-        # Validate username
-        if not username or not username.strip():
-            return "Please provide a valid username."
+        logger.debug("Executing get_iam_user_details tool for user: %s", username)
 
-        username = username.strip()
-
-        # Get user details
         client = _get_iam_client()
-        user_response = client.get_user(username)
-
-        if isinstance(user_response, str):  # Error response
-            return user_response
-
-        user = user_response.get("User", {})
-
-        # Get user groups
-        groups_response = client.list_user_groups(username)
-        groups = []
-        if not isinstance(groups_response, str):  # Not an error
-            groups = [group["GroupName"] for group in groups_response.get("Groups", [])]
-
-        # Get inline policies
-        inline_policies_response = client.list_user_policies(username)
-        inline_policies = []
-        if not isinstance(inline_policies_response, str):  # Not an error
-            inline_policies = inline_policies_response.get("PolicyNames", [])
-
-        # Get attached policies
-        attached_policies_response = client.list_attached_user_policies(username)
-        attached_policies = []
-        if not isinstance(attached_policies_response, str):  # Not an error
-            attached_policies = [
-                policy["PolicyName"]
-                for policy in attached_policies_response.get("AttachedPolicies", [])
-            ]
+        details = _cached_user_details(client, username)
+        if details is None:
+            details = _fetch_user_details(client, username)
+        user, groups, inline_policies, attached_policies = details
 
         # Format response
         result = [f"User '{username}' details:"]
 
         if user.get("CreateDate"):
-            result.append(
-                f"- Created: {user['CreateDate'].strftime('%Y-%m-%d %H:%M:%S UTC')}"
-            )
+            result.append(f"- Created: {_format_timestamp(user['CreateDate'])}")
 
         if user.get("PasswordLastUsed"):
             result.append(
-                f"- Last password use: {user['PasswordLastUsed'].strftime('%Y-%m-%d %H:%M:%S UTC')}"
+                f"- Last password use: {_format_timestamp(user['PasswordLastUsed'])}"
             )
 
         if groups:
@@ -250,54 +337,59 @@ def get_iam_user_details(username: str) -> str:
 
         return "\n".join(result)
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
-        logger.error(f"Error in get_iam_user_details for user {username}", exc_info=e)
+        logger.error("Error in get_iam_user_details for user %s", username, exc_info=e)
         return f"Failed to get details for user '{username}': {str(e)}"
 
 
 @tool
+@require_nonempty(search_term="search term")
 def search_iam_users(search_term: str) -> str:
     """
     Searches for IAM users that match the given search term.
 
     Args:
-        search_term: The search term to match against user names
+        search_term: The search term to match against user names, or an IAM
+            path prefix starting with '/' (e.g., /engineering/)
     """
     try:
-        logger.debug(f"Executing search_iam_users tool with search term: {search_term}")
-
-        # Validate search term
-        if not search_term or not search_term.strip():
-            return "Please provide a valid search term."
-
-        search_term = search_term.strip().lower()
+        logger.debug(
+            "Executing search_iam_users tool with search term: %s", search_term
+        )
 
-        # Get all users
         client = _get_iam_client()
-        response = client.list_users()
 
-        if isinstance(response, str):  # Error response
-            return response
+        # Path prefixes are matched by IAM itself, names are matched locally
+        if search_term.startswith("/"):
+            response = client.list_users(PathPrefix=search_term)
 
-        users = response.get("Users", [])
+            matching_users = [user["UserName"] for user in response.get("Users", [])]
+        else:
+            response = client.list_users()
 
-        if not users:
-            return "No IAM users found in your AWS account."
+            users = response.get("Users", [])
 
-        # Filter users by search term
-        matching_users = [
-            user["UserName"]
-            for user in users
-            if search_term in user["UserName"].lower()
-        ]
+            if not users:
+                return "No IAM users found in your AWS account."
+
+            search_term = search_term.lower()
+            matching_users = [
+                user["UserName"]
+                for user in users
+                if search_term in user["UserName"].lower()
+            ]
 
         if not matching_users:
             return f"No IAM users found matching '{search_term}'."
 
         return f"IAM users matching '{search_term}': {', '.join(matching_users)}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error(
-            f"Error in search_iam_users with search term {search_term}", exc_info=e
+            "Error in search_iam_users with search term %s", search_term, exc_info=e
         )
         return f"Failed to search IAM users: {str(e)}"
@@ -3,21 +3,96 @@ S3 tools for AWS Assistant.
 Provides tools for S3 bucket operations.
 """
 
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import FIRST_COMPLETED, wait
+from functools import partial
+from botocore.exceptions import ClientError
 from langchain_core.tools import tool
-from aws_client import AWSClient
+from aws_client import AWSClient, AWSToolError
 from logger import logger
+from tools.aws import AWS_POOL
+from tools.aws._validation import require_nonempty
+
+# HeadBucket reports a missing bucket by status code alone
+_BUCKET_NOT_FOUND_CODES = frozenset({"404", "NoSuchBucket", "NotFound"})
+
+# ACL grantees that expose a bucket to everyone or to any AWS account
+_PUBLIC_URIS = frozenset(
+    {
+        "http://acs.amazonaws.com/groups/global/AllUsers",
+        "http://acs.amazonaws.com/groups/global/AuthenticatedUsers",
+    }
+)
+
+# Storage types whose BucketSizeBytes metrics make up a bucket's total size
+_SIZE_STORAGE_TYPES = (
+    "StandardStorage",
+    "IntelligentTieringFAStorage",
+    "IntelligentTieringIAStorage",
+    "IntelligentTieringAAStorage",
+    "IntelligentTieringAIAStorage",
+    "IntelligentTieringDAAStorage",
+    "StandardIAStorage",
+    "OneZoneIAStorage",
+    "ReducedRedundancyStorage",
+    "GlacierInstantRetrievalStorage",
+    "GlacierStorage",
+    "DeepArchiveStorage",
+)
 
 
 class S3Client(AWSClient):
     """S3 client with specialized operations."""
 
     def __init__(self, region: str = None):
-        super().__init__("s3", region)
+        # Bucket scans issue many short concurrent requests, so S3 gets a larger
+        # pool, kept-alive connections and fast timeouts that retries can absorb
+        super().__init__(
+            "s3",
+            region,
+            max_retries=5,
+            connect_timeout=3,
+            read_timeout=10,
+            max_pool_connections=64,
+            tcp_keepalive=True,
+        )
 
     def list_buckets(self):
         """List all S3 buckets."""
         return self.execute_with_retry("list_buckets", self.client.list_buckets)
 
+    def invalidate_buckets(self) -> None:
+        """Drop cached bucket listings, e.g. after a bucket is created or deleted."""
+        self.invalidate_cached("list_buckets")
+
+    def buckets_by_name(self):
+        """Index the bucket listing by bucket name."""
+        response = self.list_buckets()
+        return {bucket["Name"]: bucket for bucket in response.get("Buckets", [])}
+
+    def head_bucket(self, bucket_name: str):
+        """Check that a bucket exists and is accessible."""
+        return self.execute_with_retry(
+            "head_bucket", self.client.head_bucket, Bucket=bucket_name
+        )
+
+    def get_bucket_policy_status(self, bucket_name: str):
+        """Get whether a bucket's policy makes it public."""
+        return self.execute_with_retry(
+            "get_bucket_policy_status", self._get_bucket_policy_status, bucket_name
+        )
+
+    def _get_bucket_policy_status(self, bucket_name: str):
+        """Get a bucket's policy status, treating a missing policy as private."""
+        try:
+            return self.client.get_bucket_policy_status(Bucket=bucket_name)
+        except ClientError as e:
+            # Most buckets have no policy; that is an answer, not a failure
+            if e.response["Error"]["Code"] == "NoSuchBucketPolicy":
+                return {"PolicyStatus": {"IsPublic": False}}
+            raise
+
     def get_bucket_acl(self, bucket_name: str):
         """Get bucket ACL."""
         return self.execute_with_retry(
@@ -25,24 +100,284 @@ class S3Client(AWSClient):
         )
 
     def list_objects_v2(self, bucket_name: str, **kwargs):
-        """List objects in bucket."""
+        """List one page of objects in a bucket."""
         return self.execute_with_retry(
             "list_objects_v2", self.client.list_objects_v2, Bucket=bucket_name, **kwargs
         )
 
+    def paginate_objects(self, bucket_name: str, **kwargs):
+        """Iterate over the pages of a bucket listing."""
+        paginator = self.client.get_paginator("list_objects_v2")
+        return paginator.paginate(Bucket=bucket_name, **kwargs)
+
+    def summarize_objects(self, bucket_name: str):
+        """Count the objects in a bucket and total their size."""
+        return self.execute_with_retry(
+            "list_objects_v2", self._summarize_objects, bucket_name
+        )
+
+    def _summarize_objects(self, bucket_name: str):
+        """Accumulate object count and size page by page."""
+        # Only running totals and the current page are held, never the listing;
+        # the parsed dicts are read in place, not copied
+        count = 0
+        total_size = 0
+        for page in self.paginate_objects(bucket_name):
+            contents = page.pop("Contents", ())
+            count += len(contents)
+            total_size += sum(obj["Size"] for obj in contents)
+            # Free this page's objects before the next page is fetched, so at
+            # most one page is held at a time
+            del contents
+        return {"ObjectCount": count, "TotalSize": total_size}
+
+
+class S3ControlClient(AWSClient):
+    """S3 Control client for account-level S3 settings."""
+
+    def __init__(self, region: str = None):
+        super().__init__("s3control", region)
+
+    def get_account_public_access_block(self):
+        """Get the account-wide Block Public Access settings, or {} if unset."""
+        sts = AWSClient("sts", self.region)
+        identity = sts.execute_with_retry(
+            "get_caller_identity", sts.client.get_caller_identity
+        )
+        return self.execute_with_retry(
+            "get_public_access_block",
+            self._get_public_access_block,
+            identity["Account"],
+        )
+
+    def _get_public_access_block(self, account_id: str):
+        """Get an account's Block Public Access settings, treating none as {}."""
+        try:
+            response = self.client.get_public_access_block(AccountId=account_id)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchPublicAccessBlockConfiguration":
+                return {}
+            raise
+        return response.get("PublicAccessBlockConfiguration", {})
+
+
+class CloudWatchClient(AWSClient):
+    """CloudWatch client for reading S3 storage metrics."""
+
+    def __init__(self, region: str = None):
+        super().__init__("cloudwatch", region)
+
+    def get_bucket_summary(self, bucket_name: str):
+        """
+        Get a bucket's object count and total size from S3's daily metrics.
+
+        Returns:
+            A dict with ObjectCount, TotalSize and AsOf, the time of the
+            metrics, or None if S3 has not yet published metrics for the bucket
+        """
+        queries = [
+            _bucket_metric_query(
+                "objects", bucket_name, "NumberOfObjects", "AllStorageTypes"
+            )
+        ]
+        queries.extend(
+            _bucket_metric_query(
+                f"size{index}", bucket_name, "BucketSizeBytes", storage_type
+            )
+            for index, storage_type in enumerate(_SIZE_STORAGE_TYPES)
+        )
+
+        # Metrics are published once a day, so hour granularity keeps the
+        # request stable enough for the response cache to be reused
+        end_time = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        response = self.execute_with_retry(
+            "get_metric_data",
+            self.client.get_metric_data,
+            MetricDataQueries=queries,
+            StartTime=end_time - timedelta(days=3),
+            EndTime=end_time,
+            ScanBy="TimestampDescending",
+        )
+
+        latest = {
+            result["Id"]: (result["Values"][0], result["Timestamps"][0])
+            for result in response.get("MetricDataResults", [])
+            if result.get("Values")
+        }
+        if "objects" not in latest:
+            return None
+
+        object_count, as_of = latest.pop("objects")
+        return {
+            "ObjectCount": int(object_count),
+            "TotalSize": int(sum(value for value, _ in latest.values())),
+            "AsOf": as_of,
+        }
+
+
+def _bucket_metric_query(
+    query_id: str, bucket_name: str, metric_name: str, storage_type: str
+):
+    """Build a GetMetricData query for a daily S3 storage metric."""
+    return {
+        "Id": query_id,
+        "MetricStat": {
+            "Metric": {
+                "Namespace": "AWS/S3",
+                "MetricName": metric_name,
+                "Dimensions": [
+                    {"Name": "BucketName", "Value": bucket_name},
+                    {"Name": "StorageType", "Value": storage_type},
+                ],
+            },
+            "Period": 86400,
+            "Stat": "Average",
+        },
+    }
+
+
+_SIZE_UNITS = ("bytes", "KB", "MB", "GB", "TB")
+
+
+def _format_size(size: int) -> str:
+    """Format a byte count in the largest binary unit it fills."""
+    # Every unit is 2**10 times the last, so the bit length picks the unit
+    exponent = min((size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1) if size else 0
+    if not exponent:
+        return f"{size} bytes"
+    return f"{size / (1 << (10 * exponent)):.1f} {_SIZE_UNITS[exponent]}"
+
 
 # Global S3 client instance - will be initialized when needed
 s3_client = None
+_s3_client_lock = threading.Lock()
 
 
 def _get_s3_client():
     """Get or create S3 client instance."""
     global s3_client
+    # Tools run on worker threads, so creation is locked to avoid duplicates
     if s3_client is None:
-        s3_client = S3Client()
+        with _s3_client_lock:
+            if s3_client is None:
+                s3_client = S3Client()
     return s3_client
 
 
+s3control_client = None
+_s3control_client_lock = threading.Lock()
+
+
+def _get_s3control_client():
+    """Get or create S3 Control client instance."""
+    global s3control_client
+    if s3control_client is None:
+        with _s3control_client_lock:
+            if s3control_client is None:
+                s3control_client = S3ControlClient()
+    return s3control_client
+
+
+# CloudWatch clients by region, since S3 metrics live in the bucket's region
+cloudwatch_clients = {}
+_cloudwatch_clients_lock = threading.Lock()
+
+
+def _get_cloudwatch_client(region: str):
+    """Get or create a CloudWatch client instance for a region."""
+    client = cloudwatch_clients.get(region)
+    if client is None:
+        with _cloudwatch_clients_lock:
+            client = cloudwatch_clients.get(region)
+            if client is None:
+                client = cloudwatch_clients[region] = CloudWatchClient(region)
+    return client
+
+
+def _bucket_summary(client: S3Client, bucket_name: str, region: str):
+    """Get a bucket's object count and total size, preferring CloudWatch metrics."""
+    try:
+        summary = _get_cloudwatch_client(region).get_bucket_summary(bucket_name)
+    except AWSToolError as e:
+        # Listing a large bucket can take minutes, so failing to read metrics,
+        # e.g. without cloudwatch:GetMetricData, is reported rather than masked
+        logger.warning(
+            "Could not read CloudWatch metrics for bucket %s: %s", bucket_name, e
+        )
+        raise
+
+    if summary is not None:
+        return summary
+
+    # New buckets have no metrics yet, so fall back to listing every object
+    return client.summarize_objects(bucket_name)
+
+
+def _format_summary_source(summary) -> str:
+    """Describe where a bucket summary's figures come from, for display."""
+    if "AsOf" not in summary:
+        return "a listing of every object"
+    # S3 publishes storage metrics daily, so they can be up to two days old
+    return f"S3 daily storage metrics as of {summary['AsOf'].strftime('%Y-%m-%d')}"
+
+
+def _bucket_region(client: S3Client, bucket_name: str) -> str:
+    """Find a bucket's region with a HEAD request, which fails if it is missing."""
+    head_response = client.head_bucket(bucket_name)
+    return (
+        head_response.get("ResponseMetadata", {})
+        .get("HTTPHeaders", {})
+        .get("x-amz-bucket-region", client.region)
+    )
+
+
+def _bucket_details(client: S3Client, bucket_name: str):
+    """Get a bucket's object count and total size from its own region."""
+    return _bucket_summary(client, bucket_name, _bucket_region(client, bucket_name))
+
+
+def _format_creation_date(bucket_info) -> str:
+    """Format the creation date from a bucket listing entry for display."""
+    if "CreationDate" not in bucket_info:
+        return "Unknown"
+    return bucket_info["CreationDate"].strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def _account_public_access_block():
+    """Get the account's Block Public Access settings, or {} if unavailable."""
+    try:
+        return _get_s3control_client().get_account_public_access_block()
+    except Exception as e:
+        # Without the account settings every bucket is simply checked
+        logger.debug("Account Block Public Access settings unavailable: %s", e)
+        return {}
+
+
+def _is_bucket_public(
+    client: S3Client, bucket_name: str, check_acl: bool = True
+) -> bool:
+    """Check whether a bucket's policy or ACL grants access to everyone."""
+    try:
+        # S3 evaluates the policy itself; the ACL is only read if that is private
+        policy_status = client.get_bucket_policy_status(bucket_name)
+        if policy_status.get("PolicyStatus", {}).get("IsPublic"):
+            return True
+
+        if not check_acl:
+            return False
+
+        acl_response = client.get_bucket_acl(bucket_name)
+
+        return any(
+            grant.get("Grantee", {}).get("URI") in _PUBLIC_URIS
+            for grant in acl_response.get("Grants", ())
+        )
+
+    except Exception as e:
+        logger.warning("Error checking bucket %s access: %s", bucket_name, e)
+        return False
+
+
 @tool
 def list_s3_buckets() -> str:
     """
@@ -53,16 +388,17 @@ def list_s3_buckets() -> str:
         client = _get_s3_client()
         response = client.list_buckets()
 
-        if isinstance(response, str):  # Error response
-            return response
-
-        bucket_names = [bucket["Name"] for bucket in response.get("Buckets", [])]
+        bucket_names = ", ".join(
+            [bucket["Name"] for bucket in response.get("Buckets", ())]
+        )
 
         if not bucket_names:
             return "No S3 buckets found in your AWS account."
 
-        return f"S3 buckets: {', '.join(bucket_names)}."
+        return f"S3 buckets: {bucket_names}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error("Error in list_s3_buckets", exc_info=e)
         return f"Failed to list S3 buckets: {str(e)}"
@@ -76,98 +412,94 @@ def list_public_s3_buckets() -> str:
     try:
         logger.debug("Executing list_public_s3_buckets tool")
 
+        # IgnorePublicAcls disables public ACLs and RestrictPublicBuckets
+        # disables public policies for every bucket in the account
+        account_block = _account_public_access_block()
+        ignore_acls = account_block.get("IgnorePublicAcls", False)
+        if ignore_acls and account_block.get("RestrictPublicBuckets", False):
+            return "No publicly accessible S3 buckets found."
+
         # First, get all buckets
         client = _get_s3_client()
         response = client.list_buckets()
 
-        if isinstance(response, str):  # Error response
-            return response
-
-        buckets = response.get("Buckets", [])
-        public_buckets = []
+        bucket_names = [bucket["Name"] for bucket in response.get("Buckets", ())]
 
-        for bucket in buckets:
-            bucket_name = bucket["Name"]
-            try:
-                # Check bucket ACL for public access
-                acl_response = client.get_bucket_acl(bucket_name)
-
-                if isinstance(acl_response, str):  # Error response
-                    logger.warning(
-                        f"Could not check ACL for bucket {bucket_name}: {acl_response}"
-                    )
-                    continue
-
-                # Check if bucket is publicly accessible
-                for grant in acl_response.get("Grants", []):
-                    grantee = grant.get("Grantee", {})
-                    if (
-                        grantee.get("URI")
-                        == "http://acs.amazonaws.com/groups/global/AllUsers"
-                    ):
-                        public_buckets.append(bucket_name)
-                        break
-
-            except Exception as e:
-                logger.warning(f"Error checking bucket {bucket_name} ACL: {e}")
-                continue
+        # Each ACL check is a separate round trip, so they run concurrently
+        checks = AWS_POOL.map(
+            partial(_is_bucket_public, client, check_acl=not ignore_acls),
+            bucket_names,
+        )
+        public_buckets = ", ".join(
+            [
+                bucket_name
+                for bucket_name, is_public in zip(bucket_names, checks)
+                if is_public
+            ]
+        )
 
         if not public_buckets:
             return "No publicly accessible S3 buckets found."
 
-        return f"Public S3 buckets: {', '.join(public_buckets)}."
+        return f"Public S3 buckets: {public_buckets}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error("Error in list_public_s3_buckets", exc_info=e)
         return f"Failed to list public S3 buckets: {str(e)}"
 
 
 @tool
-def inspect_s3_bucket(bucket_name: str) -> str:
+@require_nonempty(bucket_name="bucket name")
+def inspect_s3_bucket(bucket_name: str, prefix: str = "") -> str:
     """
-    Lists the contents of a specified S3 bucket.
+    Lists the contents of a specified S3 bucket, one folder level at a time.
 
     Args:
         bucket_name: The name of the S3 bucket to inspect
+        prefix: Optional folder to list instead of the top level (e.g., logs/2024/)
     """
     try:
         logger.debug(f"Executing inspect_s3_bucket tool for bucket: {bucket_name}")
 
-        # Validate bucket name
-        if not bucket_name or not bucket_name.strip():
-            return "Please provide a valid bucket name."
-
-        bucket_name = bucket_name.strip()
-
         # List objects in the bucket
         client = _get_s3_client()
+        # S3 filters by prefix and groups deeper keys into folders. A single
+        # request is made: MaxKeys caps objects and folders together, whereas
+        # a paginator's MaxItems ignores folders and would walk every page
         response = client.list_objects_v2(
-            bucket_name, MaxKeys=100
-        )  # Limit to 100 objects
-
-        if isinstance(response, str):  # Error response
-            return response
+            bucket_name, Prefix=prefix, Delimiter="/", MaxKeys=100
+        )
 
-        objects = response.get("Contents", [])
+        folders = response.get("CommonPrefixes", ())
+        objects = response.get("Contents", ())
+        location = f"'{bucket_name}'" + (f" under '{prefix}'" if prefix else "")
 
-        if not objects:
-            return f"The bucket '{bucket_name}' is empty."
+        if not folders and not objects:
+            return f"The bucket {location} is empty."
 
-        # Extract object names
-        object_names = [obj["Key"] for obj in objects]
+        # Folder entries end in "/", which sets them apart from object keys
+        entries = ", ".join(
+            [folder["Prefix"] for folder in folders] + [obj["Key"] for obj in objects]
+        )
 
         # If there are more objects, indicate this
-        if response.get("IsTruncated", False):
-            return f"The bucket '{bucket_name}' contains {len(object_names)} objects (showing first 100): {', '.join(object_names)}."
+        if response.get("IsTruncated"):
+            shown = len(folders) + len(objects)
+            return f"The bucket {location} contains more than {shown} entries (showing first {shown}): {entries}."
         else:
-            return f"The bucket '{bucket_name}' contains: {', '.join(object_names)}."
+            return f"The bucket {location} contains: {entries}."
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error(f"Error in inspect_s3_bucket for bucket {bucket_name}", exc_info=e)
         return f"Failed to inspect bucket '{bucket_name}': {str(e)}"
 
 
 @tool
+@require_nonempty(bucket_name="bucket name")
 def get_s3_bucket_info(bucket_name: str) -> str:
     """
     Gets detailed information about a specific S3 bucket including size, object count, and creation date.
@@ -178,54 +510,109 @@ def get_s3_bucket_info(bucket_name: str) -> str:
     try:
         logger.debug(f"Executing get_s3_bucket_info tool for bucket: {bucket_name}")
 
-        if not bucket_name or not bucket_name.strip():
-            return "Please provide a valid bucket name."
-
-        bucket_name = bucket_name.strip()
-
         client = _get_s3_client()
-        bucket_response = client.list_buckets()
-
-        if isinstance(bucket_response, str):
-            return bucket_response
-
-        bucket_info = None
-        for bucket in bucket_response.get("Buckets", []):
-            if bucket["Name"] == bucket_name:
-                bucket_info = bucket
-                break
 
-        if not bucket_info:
-            return f"Bucket '{bucket_name}' not found."
-
-        objects_response = client.list_objects_v2(bucket_name)
-
-        if isinstance(objects_response, str):
-            return f"Bucket '{bucket_name}' found, but could not retrieve object information: {objects_response}"
-
-        objects = objects_response.get("Contents", [])
-        total_size = sum(obj.get("Size", 0) for obj in objects)
-
-        if total_size < 1024:
-            size_str = f"{total_size} bytes"
-        elif total_size < 1024 * 1024:
-            size_str = f"{total_size / 1024:.1f} KB"
-        elif total_size < 1024 * 1024 * 1024:
-            size_str = f"{total_size / (1024 * 1024):.1f} MB"
-        else:
-            size_str = f"{total_size / (1024 * 1024 * 1024):.1f} GB"
-
-        creation_date = bucket_info["CreationDate"].strftime("%Y-%m-%d %H:%M:%S UTC")
+        # A single HEAD confirms the bucket exists without listing every bucket
+        try:
+            region = _bucket_region(client, bucket_name)
+        except AWSToolError as e:
+            if e.code in _BUCKET_NOT_FOUND_CODES:
+                return f"Bucket '{bucket_name}' not found."
+            raise
+
+        try:
+            summary = _bucket_summary(client, bucket_name, region)
+        except AWSToolError as e:
+            return f"Bucket '{bucket_name}' found, but could not retrieve object information: {e}"
+
+        # Only buckets owned by this account are listed with a creation date
+        creation_date = _format_creation_date(
+            client.buckets_by_name().get(bucket_name, {})
+        )
 
         return (
             f"Bucket '{bucket_name}' information:\n"
             f"- Creation date: {creation_date}\n"
-            f"- Object count: {len(objects)}\n"
-            f"- Total size: {size_str}"
+            f"- Object count: {summary['ObjectCount']}\n"
+            f"- Total size: {_format_size(summary['TotalSize'])}\n"
+            f"- Source: {_format_summary_source(summary)}"
         )
 
+    except AWSToolError as e:
+        return str(e)
     except Exception as e:
         logger.error(
             f"Error in get_s3_bucket_info for bucket {bucket_name}", exc_info=e
         )
         return f"Failed to get information for bucket '{bucket_name}': {str(e)}"
+
+
+@tool
+def audit_s3_public_buckets_with_info() -> str:
+    """
+    Finds publicly accessible S3 buckets and reports each one's size, object count, and creation date in one step.
+    """
+    try:
+        logger.debug("Executing audit_s3_public_buckets_with_info tool")
+
+        account_block = _account_public_access_block()
+        ignore_acls = account_block.get("IgnorePublicAcls", False)
+        if ignore_acls and account_block.get("RestrictPublicBuckets", False):
+            return "No publicly accessible S3 buckets found."
+
+        client = _get_s3_client()
+        buckets = client.buckets_by_name()
+        check_public = partial(_is_bucket_public, client, check_acl=not ignore_acls)
+
+        # Access checks and detail lookups share the pool: a bucket's details
+        # are requested as soon as it is found to be public, while the
+        # remaining checks are still running
+        pending = {
+            AWS_POOL.submit(check_public, bucket_name): (bucket_name, False)
+            for bucket_name in buckets
+        }
+        details = {}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                bucket_name, is_details = pending.pop(future)
+                if is_details:
+                    details[bucket_name] = future
+                elif future.result():
+                    details_future = AWS_POOL.submit(
+                        _bucket_details, client, bucket_name
+                    )
+                    pending[details_future] = (bucket_name, True)
+
+        if not details:
+            return "No publicly accessible S3 buckets found."
+
+        result = [f"Public S3 buckets ({len(details)} of {len(buckets)}):"]
+        for bucket_name, bucket_info in buckets.items():
+            if bucket_name not in details:
+                continue
+
+            creation_date = _format_creation_date(bucket_info)
+            error = details[bucket_name].exception()
+            if error is not None:
+                result.append(
+                    f"- {bucket_name}: created {creation_date}, "
+                    f"size unavailable ({error})"
+                )
+                continue
+
+            summary = details[bucket_name].result()
+            result.append(
+                f"- {bucket_name}: created {creation_date}, "
+                f"{summary['ObjectCount']} objects, "
+                f"{_format_size(summary['TotalSize'])} "
+                f"(from {_format_summary_source(summary)})"
+            )
+
+        return "\n".join(result)
+
+    except AWSToolError as e:
+        return str(e)
+    except Exception as e:
+        logger.error("Error in audit_s3_public_buckets_with_info", exc_info=e)
+        return f"Failed to audit public S3 buckets: {str(e)}"